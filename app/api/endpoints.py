@@ -1,19 +1,24 @@
 from fastapi import APIRouter, HTTPException, WebSocket, WebSocketDisconnect
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from typing import Dict, List, Any, Optional
-import json
+from collections import OrderedDict
+from datetime import datetime
+from uuid import uuid4
+import hashlib
+import orjson
 import asyncio
 import logging
+import time
 
 from ..core.workflow_engine import WorkflowEngine
+from ..core.state import WorkflowRun, WorkflowState, NodeStatus
 from ..core.tools import tool_registry
 from ..storage.sqlite_store import SQLiteStorage
 from .models import (
     GraphCreateRequest, GraphCreateResponse,
     WorkflowRunRequest, WorkflowRunResponse,
     WorkflowStatusResponse, NodeExecutionInfo,
-    GraphListResponse, RunListResponse,
-    ToolListResponse, ToolInfo, WebSocketEvent
+    ToolListResponse, ToolInfo
 )
 
 logger = logging.getLogger(__name__)
@@ -22,78 +27,299 @@ logger = logging.getLogger(__name__)
 workflow_engine = WorkflowEngine(tool_registry)
 storage = SQLiteStorage("db/workflow.db")
 
+# Short-lived LRU for runs fetched from storage; UI clients poll the same
+# run_id repeatedly during a run, so this avoids a SQLite read per poll.
+# Bounded because entries for runs no longer in the engine (e.g. polled
+# after a restart) are never invalidated by events.
+_RUN_CACHE_TTL = 0.5  # seconds
+_RUN_CACHE_MAX = 256
+_run_cache: "OrderedDict[str, tuple]" = OrderedDict()  # run_id -> (fetched_at, WorkflowRun)
+
 # WebSocket connection manager
 class ConnectionManager:
     def __init__(self):
         self.active_connections: Dict[str, WebSocket] = {}
-    
+        self._out_queues: Dict[str, asyncio.Queue] = {}
+        self._writer_tasks: Dict[str, asyncio.Task] = {}
+        # Caps concurrent inflight broadcast puts across all clients
+        self._broadcast_sem = asyncio.Semaphore(64)
+
     async def connect(self, websocket: WebSocket, run_id: str):
         await websocket.accept()
         self.active_connections[run_id] = websocket
+        # Outgoing events go through a per-connection queue drained by a
+        # writer task, so emitters never await the socket directly and
+        # bursts of events coalesce into a single frame
+        out_queue: asyncio.Queue = asyncio.Queue(maxsize=1000)
+        self._out_queues[run_id] = out_queue
+        self._writer_tasks[run_id] = asyncio.create_task(
+            self._writer_loop(run_id, websocket, out_queue)
+        )
         logger.info(f"WebSocket connected for run {run_id}")
-    
+
     def disconnect(self, run_id: str):
-        if run_id in self.active_connections:
-            del self.active_connections[run_id]
+        if self.active_connections.pop(run_id, None) is not None:
             logger.info(f"WebSocket disconnected for run {run_id}")
-    
+        writer_task = self._writer_tasks.pop(run_id, None)
+        if writer_task:
+            writer_task.cancel()
+        self._out_queues.pop(run_id, None)
+
+    async def _writer_loop(
+        self, run_id: str, websocket: WebSocket, out_queue: asyncio.Queue,
+        max_batch: int = 32
+    ):
+        """Drain the outgoing queue, coalescing pending events per frame.
+
+        Single events are sent as a JSON object; when several events are
+        pending they are merged into one JSON array frame. Clients must
+        accept either form. Events are plain dicts encoded with orjson
+        (which handles datetimes natively) and sent as bytes, skipping
+        both Pydantic validation and the str-to-bytes encode in Starlette.
+        """
+        try:
+            while True:
+                event = await out_queue.get()
+                batch = [event]
+                while not out_queue.empty() and len(batch) < max_batch:
+                    batch.append(out_queue.get_nowait())
+
+                if len(batch) == 1:
+                    await websocket.send_bytes(orjson.dumps(event))
+                else:
+                    await websocket.send_bytes(orjson.dumps(batch))
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Failed to send WebSocket event: {e}")
+            self.disconnect(run_id)
+
     async def send_event(self, run_id: str, event_type: str, data: Dict[str, Any]):
-        if run_id in self.active_connections:
-            websocket = self.active_connections[run_id]
+        out_queue = self._out_queues.get(run_id)
+        if out_queue is not None:
+            # Plain dict matching the WebSocketEvent schema in .models,
+            # which is kept only for API documentation
+            event = {
+                "event_type": event_type,
+                "data": data,
+                "timestamp": datetime.now()
+            }
             try:
-                event = WebSocketEvent(event_type=event_type, data=data)
-                await websocket.send_text(event.model_dump_json())
-            except Exception as e:
-                logger.error(f"Failed to send WebSocket event: {e}")
-                self.disconnect(run_id)
+                out_queue.put_nowait(event)
+            except asyncio.QueueFull:
+                logger.warning(f"WebSocket queue full for run {run_id}, dropping event")
+
+    async def broadcast(self, event_type: str, data: Dict[str, Any]):
+        """Fan an event out to every connected client.
+
+        Per-connection puts run as parallel tasks under a bounded semaphore,
+        so one client with a full queue applies backpressure only to its own
+        task instead of stalling delivery to everyone else.
+        """
+        if not self._out_queues:
+            return
+        event = {
+            "event_type": event_type,
+            "data": data,
+            "timestamp": datetime.now()
+        }
+        async with asyncio.TaskGroup() as tg:
+            for out_queue in list(self._out_queues.values()):
+                tg.create_task(self._bounded_put(out_queue, event))
+
+    async def _bounded_put(self, out_queue: asyncio.Queue, event: Dict[str, Any]):
+        async with self._broadcast_sem:
+            await out_queue.put(event)
 
 connection_manager = ConnectionManager()
 
+# Fixed-shape WebSocket events frequent enough to pre-serialize; only the
+# run_id and timestamp vary, so the ping path skips dict building and JSON
+# encoding entirely
+_PONG_TMPL = b'{"event_type":"pong","data":{"run_id":"%b","message":"pong"},"timestamp":"%b"}'
+_CONNECTED_TMPL = b'{"event_type":"connected","data":{"run_id":"%b","message":"WebSocket connected"},"timestamp":"%b"}'
+
+
+class PersistenceWorker:
+    """Coalesces workflow-run persistence into batched writes.
+
+    Instead of committing a transaction per workflow event, events enqueue the
+    latest run snapshot and a background task flushes them in small batches
+    (deduplicated by run_id, keeping only the most recent snapshot). This cuts
+    the commit/fsync count by an order of magnitude for busy workflows.
+    """
+
+    def __init__(self, storage: SQLiteStorage, flush_interval: float = 0.05):
+        self.storage = storage
+        self.flush_interval = flush_interval
+        self.queue: asyncio.Queue = asyncio.Queue()
+        self._task: Optional[asyncio.Task] = None
+
+    def enqueue(self, run_id: str, workflow_run) -> None:
+        """Schedule a workflow run snapshot for persistence"""
+        self.queue.put_nowait((run_id, workflow_run))
+
+    def start(self) -> None:
+        """Start the background flush task"""
+        if self._task is None:
+            self._task = asyncio.create_task(self._drain_loop())
+            logger.info("Persistence worker started")
+
+    async def stop(self) -> None:
+        """Stop the worker, flushing any pending writes"""
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self._flush_pending()
+
+    async def _drain_loop(self) -> None:
+        while True:
+            # Block until at least one write is pending, then give the
+            # debounce window a chance to accumulate more.
+            item = await self.queue.get()
+            try:
+                await asyncio.sleep(self.flush_interval)
+                await self._flush_pending(first=item)
+            except Exception as e:
+                logger.error(f"Persistence worker flush failed: {e}")
+
+    async def _flush_pending(self, first=None) -> None:
+        # Deduplicate by run_id, keeping the last snapshot seen
+        pending: Dict[str, Any] = {}
+        if first is not None:
+            pending[first[0]] = first[1]
+        while not self.queue.empty():
+            run_id, workflow_run = self.queue.get_nowait()
+            pending[run_id] = workflow_run
+        for workflow_run in pending.values():
+            try:
+                await self.storage.save_workflow_run(workflow_run)
+            except Exception as e:
+                logger.error(f"Failed to save workflow run: {e}")
+
+
+persistence_worker = PersistenceWorker(storage)
+
+# Major events whose runs get persisted; frozenset gives an O(1) membership
+# check with no per-event list allocation
+_PERSIST_EVENTS = frozenset({
+    "workflow_started", "node_completed", "workflow_completed", "workflow_failed"
+})
+
+
 # Event listener for workflow events
 async def workflow_event_listener(event_type: str, data: Dict[str, Any]):
     """Listen to workflow events and broadcast via WebSocket"""
     run_id = data.get("run_id")
-    if run_id:
-        await connection_manager.send_event(run_id, event_type, data)
-        
-        # Save workflow state for major events
-        if event_type in ["workflow_started", "node_completed", "workflow_completed", "workflow_failed"]:
-            workflow_run = workflow_engine.get_run(run_id)
-            if workflow_run:
-                try:
-                    await storage.save_workflow_run(workflow_run)
-                except Exception as e:
-                    logger.error(f"Failed to save workflow run: {e}")
+    if not run_id:
+        # Run-agnostic events fan out to every connected client
+        await connection_manager.broadcast(event_type, data)
+        return
+
+    await connection_manager.send_event(run_id, event_type, data)
+
+    # Queue workflow state persistence for major events
+    if event_type in _PERSIST_EVENTS:
+        workflow_run = workflow_engine.get_run(run_id)
+        if workflow_run:
+            persistence_worker.enqueue(run_id, workflow_run)
+
+    # Terminal events invalidate any cached status snapshot
+    if event_type in ("workflow_completed", "workflow_failed"):
+        _run_cache.pop(run_id, None)
 
 # Register event listener
 workflow_engine.add_event_listener(workflow_event_listener)
 
-# Create router
-router = APIRouter()
+# Create router; orjson is ~5-10x faster than the stdlib encoder for the
+# large state dicts and timestamp-heavy responses these endpoints return
+router = APIRouter(default_response_class=ORJSONResponse)
 
 
-@router.on_event("startup")
+# Called from main.py's lifespan. Starlette ignores router.on_event
+# handlers when the app supplies a custom lifespan, so these must be wired
+# in explicitly or the persistence worker never starts.
 async def startup_event():
-    """Initialize storage on startup"""
+    """Initialize storage and start the persistence worker"""
     await storage.initialize()
+    persistence_worker.start()
     logger.info("API started successfully")
 
 
+async def shutdown_event():
+    """Drain in-flight runs and flush pending writes on shutdown"""
+    if _pending_runs:
+        await asyncio.gather(*_pending_runs, return_exceptions=True)
+    await persistence_worker.stop()
+    await storage.close()
+
+
+# Dedup map of canonicalized definition hash -> graph_id, so reposting an
+# identical definition neither rebuilds the graph nor rewrites the DB
+_graph_hashes: Dict[str, str] = {}
+_graph_save_tasks: set = set()
+
+# Cap on simultaneously executing workflows; a burst of /graph/run requests
+# queues behind the semaphore instead of spawning unbounded concurrent LLM
+# workflows. Task references are kept so tasks aren't garbage collected
+# mid-run and can be drained on shutdown.
+_MAX_CONCURRENT_RUNS = 4
+_run_sem = asyncio.Semaphore(_MAX_CONCURRENT_RUNS)
+_pending_runs: set = set()
+
+
+async def _run_guarded(graph_id: str, initial_state: Dict[str, Any], run_id: str):
+    """Execute a workflow once a concurrency slot is free"""
+    async with _run_sem:
+        await _execute_workflow_async(graph_id, initial_state, run_id)
+
+
+def spawn_run(graph_id: str, initial_state: Dict[str, Any]) -> str:
+    """Start a background workflow run under the concurrency cap.
+
+    Single entry point for fire-and-forget runs (/graph/run and the demo
+    endpoints in main.py): the task queues behind _run_sem and its
+    reference is held in _pending_runs until completion, so it can't be
+    garbage collected mid-run and shutdown can drain it.
+    """
+    run_id = uuid4().hex
+    run_task = asyncio.create_task(_run_guarded(graph_id, initial_state, run_id))
+    _pending_runs.add(run_task)
+    run_task.add_done_callback(_pending_runs.discard)
+    return run_id
+
+
 @router.post("/graph/create", response_model=GraphCreateResponse)
 async def create_graph(request: GraphCreateRequest):
     """Create a new workflow graph"""
     try:
         # Convert to dict for engine
         definition = request.definition.model_dump()
-        
+
+        # Short-circuit identical definitions (BLAKE2b over the
+        # key-sorted JSON, so formatting differences don't matter)
+        definition_hash = hashlib.blake2b(
+            orjson.dumps(definition, option=orjson.OPT_SORT_KEYS)
+        ).hexdigest()
+        existing_id = _graph_hashes.get(definition_hash)
+        if existing_id is not None and existing_id in workflow_engine.graphs:
+            return GraphCreateResponse(graph_id=existing_id)
+
         # Create graph
         graph_id = workflow_engine.create_graph(definition)
-        
-        # Save to storage
-        await storage.save_graph(graph_id, definition)
-        
+        _graph_hashes[definition_hash] = graph_id
+
+        # Persist in the background; the response doesn't wait on the write
+        save_task = asyncio.create_task(storage.save_graph(graph_id, definition))
+        _graph_save_tasks.add(save_task)
+        save_task.add_done_callback(_graph_save_tasks.discard)
+
         return GraphCreateResponse(graph_id=graph_id)
-        
+
     except Exception as e:
         logger.error(f"Failed to create graph: {e}")
         raise HTTPException(status_code=400, detail=str(e))
@@ -103,15 +329,9 @@ async def create_graph(request: GraphCreateRequest):
 async def run_workflow(request: WorkflowRunRequest):
     """Run a workflow"""
     try:
-        # Create a run ID immediately
-        import uuid
-        run_id = str(uuid.uuid4())
-        
-        # Start workflow execution in background
-        asyncio.create_task(
-            _execute_workflow_async(request.graph_id, request.initial_state, run_id)
-        )
-        
+        # Start workflow execution in background, bounded by the run semaphore
+        run_id = spawn_run(request.graph_id, request.initial_state)
+
         # Return run information immediately
         return WorkflowRunResponse(
             run_id=run_id,
@@ -129,14 +349,15 @@ async def _execute_workflow_async(graph_id: str, initial_state: Dict[str, Any],
     try:
         # Add a small delay to ensure WebSocket can connect
         await asyncio.sleep(0.5)
-        
-        # Create workflow run with predetermined ID
-        from ..core.state import WorkflowRun, WorkflowState
+
+        # Create workflow run with predetermined ID; the current state shares
+        # the initial data and copies it lazily on first write
+        initial_ws = WorkflowState(data=initial_state)
         workflow_run = WorkflowRun(
             run_id=run_id,
             graph_id=graph_id,
-            initial_state=WorkflowState(data=initial_state),
-            current_state=WorkflowState(data=initial_state.copy())
+            initial_state=initial_ws,
+            current_state=initial_ws.share()
         )
         
         # Store the run immediately
@@ -148,10 +369,8 @@ async def _execute_workflow_async(graph_id: str, initial_state: Dict[str, Any],
             raise ValueError(f"Graph {graph_id} not found")
             
         await graph.execute(workflow_run, workflow_engine.emit_event)
-        
+
         # Update final status
-        from ..core.state import NodeStatus
-        from datetime import datetime
         workflow_run.status = NodeStatus.COMPLETED
         workflow_run.completed_at = datetime.now()
         
@@ -168,9 +387,6 @@ async def _execute_workflow_async(graph_id: str, initial_state: Dict[str, Any],
         
     except Exception as e:
         # Handle workflow failure
-        from ..core.state import NodeStatus
-        from datetime import datetime
-        
         if run_id in workflow_engine.runs:
             workflow_run = workflow_engine.runs[run_id]
             workflow_run.status = NodeStatus.FAILED
@@ -191,17 +407,29 @@ async def get_workflow_state(run_id: str):
     """Get current state of a workflow run"""
     # First try in-memory
     workflow_run = workflow_engine.get_run(run_id)
-    
-    # If not found, try storage
+
+    # If not found, try the TTL cache, then storage
     if not workflow_run:
-        workflow_run = await storage.get_workflow_run(run_id)
-    
+        cached = _run_cache.get(run_id)
+        if cached and time.monotonic() - cached[0] < _RUN_CACHE_TTL:
+            _run_cache.move_to_end(run_id)
+            workflow_run = cached[1]
+        else:
+            workflow_run = await storage.get_workflow_run(run_id)
+            if workflow_run:
+                _run_cache[run_id] = (time.monotonic(), workflow_run)
+                _run_cache.move_to_end(run_id)
+                while len(_run_cache) > _RUN_CACHE_MAX:
+                    _run_cache.popitem(last=False)
+
     if not workflow_run:
         raise HTTPException(status_code=404, detail="Workflow run not found")
     
-    # Convert node executions
+    # Convert node executions. model_construct skips Pydantic validation,
+    # which is safe here because the data comes from already-validated
+    # internal state and is the dominant cost for runs with many nodes.
     node_executions = [
-        NodeExecutionInfo(
+        NodeExecutionInfo.model_construct(
             node_id=exec.node_id,
             status=exec.status,
             started_at=exec.started_at,
@@ -209,10 +437,10 @@ async def get_workflow_state(run_id: str):
             error=exec.error,
             output=exec.output
         )
-        for exec in workflow_run.node_executions
+        for exec in workflow_run.executions()
     ]
-    
-    return WorkflowStatusResponse(
+
+    return WorkflowStatusResponse.model_construct(
         run_id=workflow_run.run_id,
         graph_id=workflow_run.graph_id,
         status=workflow_run.status,
@@ -225,26 +453,41 @@ async def get_workflow_state(run_id: str):
     )
 
 
-@router.get("/graphs", response_model=GraphListResponse)
-async def list_graphs():
-    """List all workflow graphs"""
-    try:
-        graphs = await storage.list_graphs()
-        return GraphListResponse(graphs=graphs)
-    except Exception as e:
-        logger.error(f"Failed to list graphs: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
+async def _stream_json_array(key: bytes, rows) -> Any:
+    """Stream an async iterator of dicts as {"<key>": [...]} JSON bytes"""
+    yield b'{"' + key + b'":['
+    first = True
+    async for row in rows:
+        if first:
+            first = False
+        else:
+            yield b','
+        yield orjson.dumps(row)
+    yield b']}'
 
 
-@router.get("/runs", response_model=RunListResponse)
-async def list_runs(graph_id: Optional[str] = None):
-    """List workflow runs, optionally filtered by graph_id"""
-    try:
-        runs = await storage.list_workflow_runs(graph_id)
-        return RunListResponse(runs=runs)
-    except Exception as e:
-        logger.error(f"Failed to list runs: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
+@router.get("/graphs")
+async def list_graphs(limit: int = 50, before: Optional[str] = None):
+    """List workflow graphs, newest first (keyset-paginated via `before`)"""
+    # Rows are streamed straight off the SQLite cursor instead of being
+    # materialized into a list and re-validated through Pydantic
+    return StreamingResponse(
+        _stream_json_array(b"graphs", storage.iter_graphs(limit, before)),
+        media_type="application/json"
+    )
+
+
+@router.get("/runs")
+async def list_runs(
+    graph_id: Optional[str] = None,
+    limit: int = 50,
+    before: Optional[str] = None
+):
+    """List workflow runs, newest first (keyset-paginated via `before`)"""
+    return StreamingResponse(
+        _stream_json_array(b"runs", storage.iter_workflow_runs(graph_id, limit, before)),
+        media_type="application/json"
+    )
 
 
 @router.get("/tools", response_model=ToolListResponse)
@@ -274,8 +517,7 @@ async def delete_graph(graph_id: str):
         success = await storage.delete_graph(graph_id)
         if success:
             # Also remove from engine
-            if graph_id in workflow_engine.graphs:
-                del workflow_engine.graphs[graph_id]
+            workflow_engine.graphs.pop(graph_id, None)
             return {"message": "Graph deleted successfully"}
         else:
             raise HTTPException(status_code=404, detail="Graph not found")
@@ -290,9 +532,9 @@ async def delete_run(run_id: str):
     try:
         success = await storage.delete_workflow_run(run_id)
         if success:
-            # Also remove from engine
-            if run_id in workflow_engine.runs:
-                del workflow_engine.runs[run_id]
+            # Also remove from engine and the status cache
+            _run_cache.pop(run_id, None)
+            workflow_engine.runs.pop(run_id, None)
             return {"message": "Run deleted successfully"}
         else:
             raise HTTPException(status_code=404, detail="Run not found")
@@ -305,26 +547,37 @@ async def delete_run(run_id: str):
 async def websocket_endpoint(websocket: WebSocket, run_id: str):
     """WebSocket endpoint for streaming workflow events"""
     await connection_manager.connect(websocket, run_id)
-    
+
+    # run_id is a caller-controlled path parameter; JSON-escape it once so
+    # ids containing quotes or backslashes can't corrupt the pre-serialized
+    # frames (strip the surrounding quotes orjson adds)
+    run_id_json = orjson.dumps(run_id)[1:-1]
+
     try:
         # Send initial connection event
-        await connection_manager.send_event(run_id, "connected", {
-            "run_id": run_id,
-            "message": "WebSocket connected"
-        })
-        
+        await websocket.send_bytes(
+            _CONNECTED_TMPL % (run_id_json, datetime.now().isoformat().encode())
+        )
+
         # Keep connection alive and handle messages
         while True:
             try:
                 data = await websocket.receive_text()
-                message = json.loads(data)
-                
+
+                # Fast-path the canonical ping frame without parsing it
+                if data == '{"type":"ping"}':
+                    await websocket.send_bytes(
+                        _PONG_TMPL % (run_id_json, datetime.now().isoformat().encode())
+                    )
+                    continue
+
+                message = orjson.loads(data)
+
                 # Handle different message types
                 if message.get("type") == "ping":
-                    await connection_manager.send_event(run_id, "pong", {
-                        "run_id": run_id,
-                        "message": "pong"
-                    })
+                    await websocket.send_bytes(
+                        _PONG_TMPL % (run_id_json, datetime.now().isoformat().encode())
+                    )
                     
             except WebSocketDisconnect:
                 break
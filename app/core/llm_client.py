@@ -2,7 +2,7 @@ import os
 import asyncio
 import logging
 from typing import Optional, Dict, Any
-from groq import Groq
+from groq import AsyncGroq, Groq
 from dotenv import load_dotenv
 
 # Load environment variables
@@ -10,6 +10,10 @@ load_dotenv()
 
 logger = logging.getLogger(__name__)
 
+# Quality scoring only needs a float plus a short note, so it can run on a
+# smaller/cheaper model than generation; override via GROQ_QUALITY_MODEL
+QUALITY_MODEL = os.getenv("GROQ_QUALITY_MODEL", "llama-3.1-8b-instant")
+
 
 class GroqClient:
     """Async Groq client for LLM operations"""
@@ -19,8 +23,12 @@ class GroqClient:
         if not self.api_key:
             logger.warning("GROQ_API_KEY not found in environment")
             self.client = None
+            self.async_client = None
         else:
             self.client = Groq(api_key=self.api_key)
+            # Async client for use inside the event loop; the sync client is
+            # kept for non-async callers
+            self.async_client = AsyncGroq(api_key=self.api_key)
             logger.info("Groq client initialized successfully")
     
     def is_available(self) -> bool:
@@ -44,8 +52,8 @@ class GroqClient:
 
 Summary:"""
 
-            # Create completion
-            completion = self.client.chat.completions.create(
+            # Create completion without blocking the event loop
+            completion = await self.async_client.chat.completions.create(
                 model=model,
                 messages=[{
                     "role": "user",
@@ -108,8 +116,8 @@ Text to summarize:
 
 Summary:"""
 
-            # Create streaming completion
-            completion = self.client.chat.completions.create(
+            # Create streaming completion without blocking the event loop
+            completion = await self.async_client.chat.completions.create(
                 model=model,
                 messages=[{
                     "role": "user",
@@ -123,7 +131,7 @@ Summary:"""
             
             summary_parts = []
             
-            for chunk in completion:
+            async for chunk in completion:
                 if chunk.choices[0].delta.content:
                     content = chunk.choices[0].delta.content
                     summary_parts.append(content)
@@ -159,11 +167,12 @@ Summary:"""
             raise
     
     async def refine_summary(
-        self, 
+        self,
         original_text: str,
-        current_summary: str, 
+        current_summary: str,
         target_length: int = 200,
-        model: str = "llama-3.1-8b-instant"  # Current supported model
+        model: str = "llama-3.1-8b-instant",  # Current supported model
+        callback: Optional[callable] = None
     ) -> str:
         """Refine and improve an existing summary"""
         if not self.is_available():
@@ -185,7 +194,7 @@ Please provide a refined summary that is:
 
 Refined summary:"""
 
-            completion = self.client.chat.completions.create(
+            completion = await self.async_client.chat.completions.create(
                 model=model,
                 messages=[{
                     "role": "user",
@@ -193,10 +202,28 @@ Refined summary:"""
                 }],
                 temperature=0.2,  # Very focused for refinement
                 max_tokens=target_length // 3,
-                top_p=0.8
+                top_p=0.8,
+                stream=True
             )
-            
-            refined_summary = completion.choices[0].message.content.strip()
+
+            # Stream tokens out as they arrive so WebSocket consumers see the
+            # refined summary forming instead of waiting for the full decode
+            refined_parts = []
+            async for chunk in completion:
+                content = chunk.choices[0].delta.content
+                if not content:
+                    continue
+                refined_parts.append(content)
+                if callback:
+                    try:
+                        await callback("llm_chunk", {
+                            "chunk": content,
+                            "partial_summary": "".join(refined_parts)
+                        })
+                    except Exception as e:
+                        logger.warning(f"Callback error: {e}")
+
+            refined_summary = "".join(refined_parts).strip()
             
             # Ensure refined summary doesn't exceed target_length
             if len(refined_summary) > target_length:
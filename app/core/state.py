@@ -1,8 +1,10 @@
 from typing import Dict, List, Any, Optional, Callable, Union
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, PrivateAttr
 from datetime import datetime
 from enum import Enum
 
+import orjson
+
 
 class NodeStatus(str, Enum):
     PENDING = "pending"
@@ -18,20 +20,66 @@ class WorkflowState(BaseModel):
     metadata: Dict[str, Any] = Field(default_factory=dict)
     created_at: datetime = Field(default_factory=datetime.now)
     updated_at: datetime = Field(default_factory=datetime.now)
-    
+
+    # Copy-on-write: a state created via share() references another state's
+    # data dict and only copies it on first mutation, so building a run does
+    # not duplicate potentially large initial payloads up front
+    _owns_data: bool = PrivateAttr(default=True)
+
+    # Serialized snapshot, kept until the next mutation; repeated saves of
+    # an unchanged state (initial_state in particular) reuse it
+    _json_cache: Optional[str] = PrivateAttr(default=None)
+
+    def share(self) -> 'WorkflowState':
+        """Create a state sharing this data, copied lazily on first write"""
+        shared = WorkflowState.model_construct(
+            data=self.data,
+            metadata={},
+            created_at=datetime.now(),
+            updated_at=datetime.now(),
+        )
+        shared._owns_data = False
+        self._owns_data = False
+        return shared
+
+    def _ensure_owned(self) -> None:
+        if not self._owns_data:
+            self.data = self.data.copy()
+            self._owns_data = True
+
+    def to_json(self) -> str:
+        """Serialize state to JSON, cached until the next mutation.
+
+        orjson encodes the dict-heavy payload far faster than Pydantic's
+        serializer and handles datetimes natively; the output parses back
+        through model_validate_json unchanged.
+        """
+        if self._json_cache is None:
+            self._json_cache = orjson.dumps({
+                "data": self.data,
+                "metadata": self.metadata,
+                "created_at": self.created_at,
+                "updated_at": self.updated_at,
+            }).decode()
+        return self._json_cache
+
     def get(self, key: str, default: Any = None) -> Any:
         """Get value from state data"""
         return self.data.get(key, default)
-    
+
     def set(self, key: str, value: Any) -> None:
         """Set value in state data"""
+        self._ensure_owned()
         self.data[key] = value
         self.updated_at = datetime.now()
-    
+        self._json_cache = None
+
     def update(self, updates: Dict[str, Any]) -> None:
         """Update multiple values in state"""
+        self._ensure_owned()
         self.data.update(updates)
         self.updated_at = datetime.now()
+        self._json_cache = None
 
 
 class NodeExecution(BaseModel):
@@ -45,6 +93,75 @@ class NodeExecution(BaseModel):
     logs: List[str] = Field(default_factory=list)
 
 
+class NodeExecutionLog:
+    """Parallel-array record of node executions for the engine hot path.
+
+    Columns are appended in place while a run executes; full NodeExecution
+    models are materialized only at API boundaries, so recording an
+    execution costs a few list appends instead of a model instantiation.
+    """
+
+    __slots__ = (
+        "node_ids", "statuses", "started_at", "completed_at",
+        "errors", "outputs", "logs"
+    )
+
+    def __init__(self):
+        self.node_ids: List[str] = []
+        self.statuses: List[NodeStatus] = []
+        self.started_at: List[Optional[datetime]] = []
+        self.completed_at: List[Optional[datetime]] = []
+        self.errors: List[Optional[str]] = []
+        self.outputs: List[Optional[Dict[str, Any]]] = []
+        self.logs: List[List[str]] = []
+
+    def __len__(self) -> int:
+        return len(self.node_ids)
+
+    def append(self, node_id: str, status: NodeStatus = NodeStatus.RUNNING) -> int:
+        """Record a started execution; returns its index for finish()"""
+        index = len(self.node_ids)
+        self.node_ids.append(node_id)
+        self.statuses.append(status)
+        self.started_at.append(datetime.now())
+        self.completed_at.append(None)
+        self.errors.append(None)
+        self.outputs.append(None)
+        self.logs.append([])
+        return index
+
+    def finish(
+        self,
+        index: int,
+        status: NodeStatus,
+        output: Optional[Dict[str, Any]] = None,
+        error: Optional[str] = None,
+    ) -> None:
+        """Mark the execution at index as finished"""
+        self.statuses[index] = status
+        self.completed_at[index] = datetime.now()
+        self.outputs[index] = output
+        self.errors[index] = error
+
+    def materialize(self) -> List[NodeExecution]:
+        """Build NodeExecution models from the columns"""
+        return [
+            NodeExecution(
+                node_id=node_id,
+                status=status,
+                started_at=started,
+                completed_at=completed,
+                error=error,
+                output=output,
+                logs=logs,
+            )
+            for node_id, status, started, completed, error, output, logs in zip(
+                self.node_ids, self.statuses, self.started_at,
+                self.completed_at, self.errors, self.outputs, self.logs
+            )
+        ]
+
+
 class WorkflowRun(BaseModel):
     """Tracks a complete workflow execution"""
     run_id: str
@@ -56,4 +173,20 @@ class WorkflowRun(BaseModel):
     created_at: datetime = Field(default_factory=datetime.now)
     completed_at: Optional[datetime] = None
     current_node: Optional[str] = None
-    error: Optional[str] = None
\ No newline at end of file
+    error: Optional[str] = None
+
+    # Column-oriented log the engine appends to while the run is live;
+    # node_executions stays the materialized form for reconstructed runs
+    _execution_log: Optional[NodeExecutionLog] = PrivateAttr(default=None)
+
+    @property
+    def execution_log(self) -> NodeExecutionLog:
+        if self._execution_log is None:
+            self._execution_log = NodeExecutionLog()
+        return self._execution_log
+
+    def executions(self) -> List[NodeExecution]:
+        """Node executions as models, from the log for live runs"""
+        if self._execution_log is not None and len(self._execution_log):
+            return self._execution_log.materialize()
+        return self.node_executions
\ No newline at end of file
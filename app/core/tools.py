@@ -1,6 +1,9 @@
 from typing import Dict, Callable, Any, List, Optional
 import asyncio
+import bisect
 import logging
+import re
+import time
 from functools import wraps
 
 # Import LLM client
@@ -28,10 +31,16 @@ class ToolRegistry:
         self._tool_metadata[name] = {
             "description": description,
             "async": async_func,
-            "registered_at": asyncio.get_event_loop().time()
+            "registered_at": time.monotonic()
         }
         logger.info(f"Registered tool: {name}")
     
+    def get(self, name: str) -> Callable:
+        """Return the registered tool function by name"""
+        if name not in self._tools:
+            raise ValueError(f"Tool '{name}' not found in registry")
+        return self._tools[name]
+
     def tool(self, name: str, description: str = "", async_func: bool = False):
         """Decorator to register a tool"""
         def decorator(func: Callable):
@@ -78,38 +87,50 @@ class ToolRegistry:
 tool_registry = ToolRegistry()
 
 
+# Matches the word boundaries used when snapping chunk ends
+_SPACE_RE = re.compile(r' ')
+
+
 # Summarization workflow tools
 @tool_registry.tool("split_text", "Split text into manageable chunks")
 def split_text(text: str, chunk_size: int = 1000, overlap: int = 100) -> List[str]:
     """Split text into overlapping chunks"""
     if not text:
         return []
-    
+
+    # Workflow definitions may plumb these from state; fall back to the
+    # defaults when the run didn't supply them
+    chunk_size = chunk_size or 1000
+    overlap = overlap if overlap is not None else 100
+
+    # Find all word boundaries once (C-level regex scan); each chunk end is
+    # then located with an O(log N) bisect instead of rescanning the chunk
+    # with rfind and re-slicing it
+    spaces = [m.start() for m in _SPACE_RE.finditer(text)]
+
     chunks = []
     start = 0
     text_len = len(text)
-    
+
     while start < text_len:
         end = start + chunk_size
-        if end > text_len:
+        if end >= text_len:
             end = text_len
-        
-        chunk = text[start:end]
-        
-        # Try to end at word boundary
-        if end < text_len and chunk[-1] != ' ':
-            last_space = chunk.rfind(' ')
-            if last_space > chunk_size // 2:  # Only if we find a reasonable space
-                chunk = chunk[:last_space]
-                end = start + last_space
-        
-        chunks.append(chunk.strip())
-        
+        elif text[end - 1] != ' ':
+            # Try to end at word boundary
+            boundary_idx = bisect.bisect_left(spaces, end) - 1
+            if boundary_idx >= 0:
+                boundary = spaces[boundary_idx]
+                if boundary - start > chunk_size // 2:  # Only if we find a reasonable space
+                    end = boundary
+
+        chunks.append(text[start:end].strip())
+
         if end >= text_len:
             break
-            
+
         start = end - overlap
-    
+
     return [chunk for chunk in chunks if chunk]
 
 
@@ -145,35 +166,31 @@ async def generate_summary(text: str, max_length: int = 200) -> str:
 
 
 @tool_registry.tool("merge_summaries", "Merge multiple summaries into one")
-def merge_summaries(summaries: List[str]) -> str:
-    """Merge multiple summaries with detailed logging"""
-    print(f"\n🔗 Merging Summaries Process...")
-    print(f"📊 Input: {len(summaries)} summaries to merge")
-    
+def merge_summaries(summaries: List[str], joined: Optional[str] = None) -> str:
+    """Merge multiple summaries, removing duplicates in order.
+
+    Accepts a precomputed merge via `joined` so producers that already
+    joined their summaries (process_chunks_llm) make this a no-op.
+    """
+    if joined:
+        return joined
     if not summaries:
-        print("❌ No summaries to merge")
+        logger.debug("No summaries to merge")
         return ""
-    
-    # Show each summary being merged
-    for i, summary in enumerate(summaries, 1):
-        print(f"📄 Summary {i} ({len(summary)} chars): {summary[:60]}...")
-    
-    # Remove duplicates while preserving order
-    unique_summaries = []
-    seen = set()
-    
-    for summary in summaries:
-        summary = summary.strip()
-        if summary and summary not in seen:
-            unique_summaries.append(summary)
-            seen.add(summary)
-    
-    if len(unique_summaries) < len(summaries):
-        print(f"🔄 Removed {len(summaries) - len(unique_summaries)} duplicate summaries")
-    
+
+    # dict.fromkeys deduplicates in C while preserving insertion order
+    unique_summaries = list(dict.fromkeys(
+        stripped for s in summaries if s and (stripped := s.strip())
+    ))
+
     merged = ' '.join(unique_summaries)
-    print(f"✅ Merged result ({len(merged)} chars): {merged[:100]}...")
-    
+
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(
+            "Merged %d summaries (%d unique) into %d chars: %.100s",
+            len(summaries), len(unique_summaries), len(merged), merged
+        )
+
     return merged
 
 
@@ -209,23 +226,43 @@ async def refine_summary(summary: str, target_length: int = 500) -> str:
     return '. '.join(refined_sentences) + '.'
 
 
+# Tokenized originals, keyed by the text itself (dicts compare keys on
+# hash collision, so this can't silently return another text's words).
+# Refinement loops score several summaries against the same source text,
+# so tokenize and freeze it once; frozenset intersection then runs
+# entirely in C.
+_original_words_cache: Dict[str, frozenset] = {}
+_ORIGINAL_WORDS_CACHE_MAX = 64
+
+
+def _get_original_words(original_text: str) -> frozenset:
+    """Get the (cached) word set for an original text"""
+    words = _original_words_cache.get(original_text)
+    if words is None:
+        if len(_original_words_cache) >= _ORIGINAL_WORDS_CACHE_MAX:
+            _original_words_cache.clear()
+        words = frozenset(original_text.lower().split())
+        _original_words_cache[original_text] = words
+    return words
+
+
 @tool_registry.tool("calculate_summary_score", "Calculate quality score for summary")
 def calculate_summary_score(original_text: str, summary: str) -> float:
     """Calculate a simple quality score for the summary"""
     if not original_text or not summary:
         return 0.0
-    
+
     # Simple scoring based on compression ratio and content preservation
     compression_ratio = len(summary) / len(original_text)
-    
+
     # Check for key terms preservation (simple word overlap)
-    original_words = set(original_text.lower().split())
+    original_words = _get_original_words(original_text)
     summary_words = set(summary.lower().split())
-    
+
     if not original_words:
         return 0.0
-    
-    word_overlap = len(original_words.intersection(summary_words)) / len(original_words)
+
+    word_overlap = len(original_words & summary_words) / len(original_words)
     
     # Score combines compression efficiency and content preservation
     score = (word_overlap * 0.7) + (min(1.0, 1.0 - compression_ratio) * 0.3)
@@ -289,16 +326,24 @@ async def llm_summarize_streaming(
 @tool_registry.tool("llm_refine_summary", "Refine summary using Groq LLM", async_func=True)
 async def llm_refine_summary(
     original_text: str,
-    summary: str, 
-    target_length: int = 200
+    summary: str,
+    target_length: int = 200,
+    event_emitter: Optional[callable] = None
 ) -> str:
     """Refine summary using Groq LLM with fallback"""
     if not summary:
         return ""
-    
+
     try:
         if groq_client.is_available():
-            return await groq_client.refine_summary(original_text, summary, target_length)
+            async def streaming_callback(event_type: str, data: Dict[str, Any]):
+                if event_emitter:
+                    await event_emitter(event_type, data)
+
+            return await groq_client.refine_summary(
+                original_text, summary, target_length,
+                callback=streaming_callback
+            )
         else:
             logger.warning("Groq not available, falling back to rule-based refinement")
             return await refine_summary(summary, target_length)
@@ -313,45 +358,40 @@ async def hybrid_summarize(text: str, max_length: int = 200, prefer_llm: bool =
     """Hybrid tool that uses LLM when available, rule-based as fallback with detailed logging"""
     if not text:
         return ""
-    
-    print(f"\n🤖 Hybrid Summarization Starting...")
-    print(f"📝 Input length: {len(text)} characters")
-    print(f"🎯 Target length: {max_length} characters")
-    print(f"📄 Text preview: {text[:100]}...")
-    
+
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(
+            "Hybrid summarization: %d chars -> target %d, preview: %.100s",
+            len(text), max_length, text
+        )
+
     if prefer_llm and groq_client.is_available():
         try:
-            print("🔥 Using Groq LLM for intelligent summarization...")
             result = await groq_client.summarize_text(text, max_length)
-            print(f"✅ LLM Summary generated ({len(result)} chars): {result[:80]}...")
+            logger.debug("LLM summary generated (%d chars)", len(result))
             return result
         except Exception as e:
-            print(f"❌ LLM failed: {e}")
-            print("🔄 Falling back to rule-based summarization...")
+            logger.warning(f"LLM failed: {e}, falling back to rule-based summarization")
     else:
-        print("⚠️ LLM not available, using rule-based summarization...")
-    
+        logger.debug("LLM not available, using rule-based summarization")
+
     result = await generate_summary(text, max_length)
-    print(f"✅ Rule-based summary generated ({len(result)} chars): {result[:80]}...")
+    logger.debug("Rule-based summary generated (%d chars)", len(result))
     return result
 
 
 @tool_registry.tool("finalize_summary", "Finalize the workflow summary")
 def finalize_summary(summary: str = "", **kwargs) -> Dict[str, Any]:
-    """Finalize the summary by setting it as the final result with logging"""
-    print(f"\n🏁 Finalizing Summary...")
-    print(f"📝 Input summary ({len(summary)} chars): {summary[:100]}...")
-    
+    """Finalize the summary by setting it as the final result"""
     final_summary = summary.strip() if summary else "No summary generated"
-    
-    print(f"✅ Final summary set: {final_summary[:100]}...")
-    print(f"📏 Final length: {len(final_summary)} characters")
-    
-    result = {
+
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(
+            "Finalized summary (%d chars): %.100s", len(final_summary), final_summary
+        )
+
+    return {
         "final_summary": final_summary,
         "summary_length": len(final_summary),
         "status": "completed"
-    }
-    
-    print(f"🎉 Finalization complete!")
-    return result
\ No newline at end of file
+    }
\ No newline at end of file
@@ -1,11 +1,18 @@
-from typing import Dict, List, Any, Optional, Callable, Union
+from typing import Dict, List, Any, Optional, Callable, Tuple, Union
 import asyncio
+import hashlib
 import logging
-import uuid
+import operator
+import os
+import sys
+from uuid import uuid4
+from collections import OrderedDict
 from datetime import datetime
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 
-from .state import WorkflowState, WorkflowRun, NodeExecution, NodeStatus
+import orjson
+
+from .state import WorkflowState, WorkflowRun, NodeStatus
 from .tools import tool_registry, ToolRegistry
 
 logger = logging.getLogger(__name__)
@@ -21,98 +28,248 @@ class Edge:
     condition_value: Any = None
 
 
-@dataclass 
+@dataclass
 class Node:
     """Represents a workflow node"""
     id: str
     tool_name: str
     params: Dict[str, Any]
     description: str = ""
+    # Params partitioned once at graph build: literal values vs the
+    # (param_name, state_key) pairs resolved from state at execution time
+    static_params: Dict[str, Any] = field(default_factory=dict)
+    dynamic_params: Tuple[Tuple[str, str], ...] = ()
+
+    def __post_init__(self):
+        static: Dict[str, Any] = {}
+        dynamic: List[Tuple[str, str]] = []
+        for key, value in self.params.items():
+            if isinstance(value, str) and value.startswith("$state."):
+                # Interned so the per-execution state lookups compare by
+                # pointer first
+                dynamic.append((key, sys.intern(value[7:])))
+            else:
+                static[key] = value
+        self.static_params = static
+        self.dynamic_params = tuple(dynamic)
+
+
+# Condition operators, specialized once at graph construction instead of
+# re-branching over condition_type on every edge evaluation. Ordering
+# comparisons treat None on either side as False, matching the old checks.
+def _safe_gt(a: Any, b: Any) -> bool:
+    return a is not None and b is not None and a > b
+
+
+def _safe_lt(a: Any, b: Any) -> bool:
+    return a is not None and b is not None and a < b
+
+
+def _safe_gte(a: Any, b: Any) -> bool:
+    return a is not None and b is not None and a >= b
+
+
+def _safe_lte(a: Any, b: Any) -> bool:
+    return a is not None and b is not None and a <= b
+
+
+_OPS: Dict[str, Callable[[Any, Any], bool]] = {
+    "eq": operator.eq,
+    "gt": _safe_gt,
+    "lt": _safe_lt,
+    "gte": _safe_gte,
+    "lte": _safe_lte,
+    "exists": lambda a, b: a is not None,
+    "not_exists": lambda a, b: a is None,
+}
 
 
 class ConditionalRouter:
     """Handles conditional routing logic"""
-    
+
     @staticmethod
     def create_condition(condition_type: str, key: str, value: Any) -> Callable[[WorkflowState], bool]:
         """Create a condition function"""
-        def condition_func(state: WorkflowState) -> bool:
-            state_value = state.get(key)
-            
-            # Resolve value if it's a state reference
-            if isinstance(value, str) and value.startswith("$state."):
-                state_key = value[7:]  # Remove "$state." prefix
-                comparison_value = state.get(state_key)
-            else:
-                comparison_value = value
-            
-            if condition_type == "eq":
-                return state_value == comparison_value
-            elif condition_type == "gt":
-                return state_value is not None and comparison_value is not None and state_value > comparison_value
-            elif condition_type == "lt": 
-                return state_value is not None and comparison_value is not None and state_value < comparison_value
-            elif condition_type == "gte":
-                return state_value is not None and comparison_value is not None and state_value >= comparison_value
-            elif condition_type == "lte":
-                return state_value is not None and comparison_value is not None and state_value <= comparison_value
-            elif condition_type == "exists":
-                return state_value is not None
-            elif condition_type == "not_exists":
-                return state_value is None
-            else:
-                return False
-        
+        op = _OPS.get(condition_type)
+        if op is None:
+            return lambda state: False
+
+        # Resolve whether value is a state reference once, not per call
+        if isinstance(value, str) and value.startswith("$state."):
+            ref_key = value[7:]  # Remove "$state." prefix
+
+            def condition_func(state: WorkflowState) -> bool:
+                # One bound-method construction for both lookups
+                state_get = state.get
+                return op(state_get(key), state_get(ref_key))
+        else:
+            def condition_func(state: WorkflowState) -> bool:
+                return op(state.get(key), value)
+
         return condition_func
 
 
+class ResponseCache:
+    """Exact-match LRU of final workflow states keyed by (graph, input).
+
+    LLM inference dominates run wall time, so re-running a graph on
+    identical input can skip execution entirely and replay the cached final
+    state. Keys hash the key-sorted input JSON, so dict ordering and
+    formatting don't affect hits.
+    """
+
+    def __init__(self, max_entries: int = 256):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+
+    @staticmethod
+    def key(graph_id: str, initial_state: Dict[str, Any]) -> str:
+        payload = orjson.dumps(initial_state, option=orjson.OPT_SORT_KEYS, default=str)
+        return hashlib.sha256(payload + graph_id.encode()).hexdigest()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        self._entries.move_to_end(key)
+        # Shallow copy so callers mutating the returned state don't poison
+        # the cache
+        return dict(entry)
+
+    def put(self, key: str, state_data: Dict[str, Any]) -> None:
+        if key in self._entries:
+            self._entries.move_to_end(key)
+        elif len(self._entries) >= self.max_entries:
+            self._entries.popitem(last=False)
+        self._entries[key] = dict(state_data)
+
+
 class WorkflowEngine:
     """Core workflow execution engine"""
-    
-    def __init__(self, tool_registry: ToolRegistry = None):
+
+    def __init__(
+        self,
+        tool_registry: ToolRegistry = None,
+        debug_delay: float = None,
+        response_cache: Optional[ResponseCache] = None,
+    ):
         self.tool_registry = tool_registry or tool_registry
         self.graphs: Dict[str, 'WorkflowGraph'] = {}
         self.runs: Dict[str, WorkflowRun] = {}
         self.event_listeners: List[Callable] = []
+        # Partitioned once at registration so emit_event doesn't re-check
+        # iscoroutinefunction per listener per event
+        self._async_listeners: List[Callable] = []
+        self._sync_listeners: List[Callable] = []
+        # Optional per-node pause for demos that want to watch events
+        # arrive; off by default so workflows run at tool speed
+        if debug_delay is None:
+            debug_delay = float(os.environ.get("WORKFLOW_DEBUG_DELAY", "0") or 0)
+        self.debug_delay = debug_delay
+        # Exact-match replay of completed runs; set to None to disable
+        self.response_cache = response_cache or ResponseCache()
     
     def add_event_listener(self, listener: Callable) -> None:
         """Add event listener for workflow events"""
         self.event_listeners.append(listener)
-    
+        if asyncio.iscoroutinefunction(listener):
+            self._async_listeners.append(listener)
+        else:
+            self._sync_listeners.append(listener)
+
+    def remove_event_listener(self, listener: Callable) -> None:
+        """Remove a previously added event listener"""
+        for listeners in (
+            self.event_listeners, self._async_listeners, self._sync_listeners
+        ):
+            if listener in listeners:
+                listeners.remove(listener)
+
     async def emit_event(self, event_type: str, data: Dict[str, Any]) -> None:
-        """Emit event to all listeners"""
-        for listener in self.event_listeners:
+        """Emit event to all listeners, awaiting async ones concurrently"""
+        for listener in self._sync_listeners:
             try:
-                if asyncio.iscoroutinefunction(listener):
-                    await listener(event_type, data)
-                else:
-                    listener(event_type, data)
+                listener(event_type, data)
             except Exception as e:
                 logger.error(f"Event listener error: {e}")
+
+        if not self._async_listeners:
+            return
+        if len(self._async_listeners) == 1:
+            try:
+                await self._async_listeners[0](event_type, data)
+            except Exception as e:
+                logger.error(f"Event listener error: {e}")
+            return
+        results = await asyncio.gather(
+            *(listener(event_type, data) for listener in self._async_listeners),
+            return_exceptions=True
+        )
+        for result in results:
+            if isinstance(result, Exception):
+                logger.error(f"Event listener error: {result}")
     
     def create_graph(self, graph_definition: Dict[str, Any]) -> str:
         """Create a new workflow graph"""
-        graph_id = str(uuid.uuid4())
+        graph_id = uuid4().hex
         graph = WorkflowGraph.from_definition(graph_definition, self.tool_registry)
         self.graphs[graph_id] = graph
         
         logger.info(f"Created graph {graph_id} with {len(graph.nodes)} nodes")
         return graph_id
     
-    async def run_workflow(self, graph_id: str, initial_state: Dict[str, Any]) -> WorkflowRun:
+    async def run_workflow(
+        self,
+        graph_id: str,
+        initial_state: Dict[str, Any],
+        run_id: Optional[str] = None,
+    ) -> WorkflowRun:
         """Execute a workflow"""
         if graph_id not in self.graphs:
             raise ValueError(f"Graph {graph_id} not found")
-        
+
         graph = self.graphs[graph_id]
-        run_id = str(uuid.uuid4())
-        
-        # Create workflow run
+        run_id = run_id or uuid4().hex
+
+        # Replay a cached final state for identical (graph, input) pairs;
+        # skips every tool and LLM call of the run
+        cache_key = None
+        if self.response_cache is not None:
+            cache_key = ResponseCache.key(graph_id, initial_state)
+            cached_state = self.response_cache.get(cache_key)
+            if cached_state is not None:
+                logger.info(f"Response cache hit for graph {graph_id}")
+                workflow_run = WorkflowRun(
+                    run_id=run_id,
+                    graph_id=graph_id,
+                    initial_state=WorkflowState(data=initial_state),
+                    current_state=WorkflowState(data=cached_state)
+                )
+                workflow_run.status = NodeStatus.COMPLETED
+                workflow_run.completed_at = datetime.now()
+                self.runs[run_id] = workflow_run
+                # Replays still announce themselves so event consumers
+                # (WebSocket clients, stream_workflow) observe a terminal
+                # event for the run
+                await self.emit_event("workflow_started", {
+                    "run_id": run_id,
+                    "graph_id": graph_id
+                })
+                await self.emit_event("workflow_completed", {
+                    "run_id": run_id,
+                    "status": "completed",
+                    "cached": True
+                })
+                return workflow_run
+
+        # Create workflow run; current state shares the initial data and
+        # copies it lazily on first write
+        initial_ws = WorkflowState(data=initial_state)
         workflow_run = WorkflowRun(
             run_id=run_id,
             graph_id=graph_id,
-            initial_state=WorkflowState(data=initial_state),
-            current_state=WorkflowState(data=initial_state.copy())
+            initial_state=initial_ws,
+            current_state=initial_ws.share()
         )
         
         self.runs[run_id] = workflow_run
@@ -124,7 +281,7 @@ class WorkflowEngine:
                 "graph_id": graph_id
             })
             
-            await graph.execute(workflow_run, self.emit_event)
+            await graph.execute(workflow_run, self.emit_event, self.debug_delay)
             
             workflow_run.status = NodeStatus.COMPLETED
             workflow_run.completed_at = datetime.now()
@@ -133,7 +290,10 @@ class WorkflowEngine:
                 "run_id": run_id,
                 "status": "completed"
             })
-            
+
+            if cache_key is not None:
+                self.response_cache.put(cache_key, workflow_run.current_state.data)
+
         except Exception as e:
             workflow_run.status = NodeStatus.FAILED
             workflow_run.error = str(e)
@@ -148,7 +308,46 @@ class WorkflowEngine:
             raise
         
         return workflow_run
-    
+
+    async def stream_workflow(self, graph_id: str, initial_state: Dict[str, Any]):
+        """Run a workflow, yielding its events as they occur.
+
+        Async-generator counterpart to run_workflow: every engine event
+        belonging to this run is yielded as an {"event_type", "data"} dict,
+        ending with workflow_completed or workflow_failed, so consumers
+        overlap their own handling with tool and LLM execution instead of
+        blocking for the full run. The finished WorkflowRun is available
+        through get_run() afterwards; failures surface as a workflow_failed
+        event rather than an exception.
+        """
+        run_id = uuid4().hex
+        events: asyncio.Queue = asyncio.Queue()
+        done = object()  # sentinel; never yielded
+
+        def listener(event_type: str, data: Dict[str, Any]) -> None:
+            # Engine listeners are global; keep only this run's events so
+            # concurrent streams don't see each other
+            if data.get("run_id") == run_id:
+                events.put_nowait({"event_type": event_type, "data": data})
+
+        self.add_event_listener(listener)
+        task = asyncio.create_task(
+            self.run_workflow(graph_id, initial_state, run_id=run_id)
+        )
+        # Events are enqueued before the task finishes, so the sentinel
+        # always trails the terminal event
+        task.add_done_callback(lambda _: events.put_nowait(done))
+        try:
+            while (event := await events.get()) is not done:
+                yield event
+        finally:
+            self.remove_event_listener(listener)
+            if not task.done():
+                task.cancel()
+            # Failure was already surfaced as workflow_failed; collect the
+            # exception so it isn't reported as never retrieved
+            await asyncio.gather(task, return_exceptions=True)
+
     def get_run(self, run_id: str) -> Optional[WorkflowRun]:
         """Get workflow run by ID"""
         return self.runs.get(run_id)
@@ -166,6 +365,13 @@ class WorkflowGraph:
         self.edges: List[Edge] = []
         self.start_node: Optional[str] = None
         self.tool_registry: Optional[ToolRegistry] = None
+        # Outgoing edges indexed by source node, frozen to tuples; routing
+        # reads this instead of scanning the full edge list per step
+        self.adjacency: Dict[str, tuple] = {}
+        # Unconditional-predecessor counts, computed once per definition and
+        # used by execute() to schedule join nodes only after every
+        # unconditional branch into them has finished
+        self.base_in_degree: Dict[str, int] = {}
     
     @classmethod
     def from_definition(cls, definition: Dict[str, Any], tool_registry: ToolRegistry) -> 'WorkflowGraph':
@@ -175,9 +381,11 @@ class WorkflowGraph:
         
         # Add nodes
         for node_def in definition.get("nodes", []):
+            # Interned IDs make the dict/set lookups on every traversal
+            # hit CPython's pointer-equality fast path
             node = Node(
-                id=node_def["id"],
-                tool_name=node_def["tool"],
+                id=sys.intern(node_def["id"]),
+                tool_name=sys.intern(node_def["tool"]),
                 params=node_def.get("params", {}),
                 description=node_def.get("description", "")
             )
@@ -186,8 +394,8 @@ class WorkflowGraph:
         # Add edges
         for edge_def in definition.get("edges", []):
             edge = Edge(
-                from_node=edge_def["from"],
-                to_node=edge_def["to"]
+                from_node=sys.intern(edge_def["from"]),
+                to_node=sys.intern(edge_def["to"])
             )
             
             # Add condition if specified
@@ -205,56 +413,176 @@ class WorkflowGraph:
         graph.start_node = definition.get("start_node")
         if not graph.start_node and graph.nodes:
             graph.start_node = list(graph.nodes.keys())[0]
-        
+
+        # Index outgoing edges by source node so routing is O(deg(node))
+        adjacency: Dict[str, List[Edge]] = {}
+        for edge in graph.edges:
+            adjacency.setdefault(edge.from_node, []).append(edge)
+        graph.adjacency = {
+            node_id: tuple(edges) for node_id, edges in adjacency.items()
+        }
+
+        # Precompute unconditional in-degrees for the parallel scheduler.
+        # Conditional edges are excluded: they fire their target directly
+        # when the condition holds (this is what makes refine loops work)
+        graph.base_in_degree = {node_id: 0 for node_id in graph.nodes}
+        for edge in graph.edges:
+            if edge.condition is None and edge.to_node in graph.base_in_degree:
+                graph.base_in_degree[edge.to_node] += 1
+
+        graph._reject_unconditional_cycles()
+
         return graph
+
+    def _reject_unconditional_cycles(self) -> None:
+        """Refuse graphs whose cycles no condition can ever break.
+
+        Runs iterative Tarjan's SCC over the adjacency map once at build
+        time. A strongly connected component is a legitimate loop only if
+        at least one edge inside it is conditional (like the refine /
+        quality-check loop); otherwise execution could only terminate by
+        exhausting the runtime iteration cap, so fail fast instead.
+        """
+        index_of: Dict[str, int] = {}
+        lowlink: Dict[str, int] = {}
+        on_stack: Dict[str, bool] = {}
+        stack: List[str] = []
+        counter = 0
+
+        for root in self.nodes:
+            if root in index_of:
+                continue
+            work = [(root, iter(self.adjacency.get(root, ())))]
+            index_of[root] = lowlink[root] = counter
+            counter += 1
+            stack.append(root)
+            on_stack[root] = True
+
+            while work:
+                node, edge_iter = work[-1]
+                advanced = False
+                for edge in edge_iter:
+                    target = edge.to_node
+                    if target not in self.nodes:
+                        continue
+                    if target not in index_of:
+                        index_of[target] = lowlink[target] = counter
+                        counter += 1
+                        stack.append(target)
+                        on_stack[target] = True
+                        work.append((target, iter(self.adjacency.get(target, ()))))
+                        advanced = True
+                        break
+                    elif on_stack.get(target):
+                        lowlink[node] = min(lowlink[node], index_of[target])
+                if advanced:
+                    continue
+
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    lowlink[parent] = min(lowlink[parent], lowlink[node])
+                if lowlink[node] == index_of[node]:
+                    component = set()
+                    while True:
+                        member = stack.pop()
+                        on_stack[member] = False
+                        component.add(member)
+                        if member == node:
+                            break
+                    self._check_component(component)
+
+    def _check_component(self, component: set) -> None:
+        internal_edges = [
+            edge
+            for member in component
+            for edge in self.adjacency.get(member, ())
+            if edge.to_node in component
+        ]
+        # Single node with no self-edge is not a cycle
+        if len(component) == 1 and not internal_edges:
+            return
+        if internal_edges and not any(edge.condition for edge in internal_edges):
+            raise ValueError(
+                f"Unconditional cycle detected among nodes {sorted(component)}; "
+                "add a condition to at least one edge in the loop"
+            )
     
-    async def execute(self, workflow_run: WorkflowRun, event_emitter: Callable) -> None:
-        """Execute the workflow"""
+    async def execute(
+        self,
+        workflow_run: WorkflowRun,
+        event_emitter: Callable,
+        debug_delay: float = 0.0
+    ) -> None:
+        """Execute the workflow, running independent branches concurrently.
+
+        Scheduling is Kahn-style over the unconditional edges: a node runs
+        once every unconditional branch into it has completed, so forks run
+        in parallel and joins wait for all of their inputs. Conditional
+        edges schedule their target directly when the condition holds,
+        which preserves the refine/quality-check loop semantics; a node's
+        in-degree is re-armed when it is scheduled so loops can re-enter it.
+        """
         if not self.start_node:
             raise ValueError("No start node defined")
-        
-        current_node = self.start_node
-        visited_nodes = set()
-        max_iterations = 100  # Prevent infinite loops
+
+        pending_preds = dict(self.base_in_degree)
+        running: Dict[asyncio.Task, str] = {}
+        state_lock = asyncio.Lock()
+        # Cycles that nothing can break are rejected at build time, so
+        # this cap is only a safety net for runaway conditional loops
+        max_iterations = 100
         iterations = 0
-        
-        while current_node and iterations < max_iterations:
-            iterations += 1
-            
-            # Check for loops (allow limited loops)
-            if current_node in visited_nodes and iterations > 10:
-                logger.warning(f"Potential infinite loop detected at node {current_node}")
-                break
-            
-            visited_nodes.add(current_node)
-            workflow_run.current_node = current_node
-            
-            # Execute current node
-            await self._execute_node(current_node, workflow_run, event_emitter)
-            
-            # Find next node
-            next_nodes = self._get_next_nodes(current_node, workflow_run.current_state)
-            
-            if not next_nodes:
-                break
-            elif len(next_nodes) == 1:
-                current_node = next_nodes[0]
-            else:
-                # Multiple paths - for now, take first valid one
-                current_node = next_nodes[0]
-                logger.warning(f"Multiple next nodes found, taking first: {current_node}")
+
+        def schedule(node_id: str) -> None:
+            # Re-arm so a later loop back into this node waits for its
+            # unconditional predecessors again
+            pending_preds[node_id] = self.base_in_degree.get(node_id, 0)
+            running[asyncio.create_task(
+                self._execute_node(
+                    node_id, workflow_run, event_emitter, state_lock, debug_delay
+                )
+            )] = node_id
+
+        schedule(self.start_node)
+
+        try:
+            while running and iterations < max_iterations:
+                done, _ = await asyncio.wait(
+                    running, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    node_id = running.pop(task)
+                    iterations += 1
+                    task.result()  # Propagate node failure
+
+                    for next_node in self._get_next_nodes(
+                        node_id, workflow_run.current_state, pending_preds
+                    ):
+                        schedule(next_node)
+        finally:
+            # A failed node aborts the run; don't leave siblings running
+            for task in running:
+                task.cancel()
+            if running:
+                await asyncio.gather(*running, return_exceptions=True)
     
-    async def _execute_node(self, node_id: str, workflow_run: WorkflowRun, event_emitter: Callable) -> None:
+    async def _execute_node(
+        self,
+        node_id: str,
+        workflow_run: WorkflowRun,
+        event_emitter: Callable,
+        state_lock: asyncio.Lock,
+        debug_delay: float = 0.0
+    ) -> None:
         """Execute a single node"""
         if node_id not in self.nodes:
             raise ValueError(f"Node {node_id} not found")
-        
+
         node = self.nodes[node_id]
-        execution = NodeExecution(node_id=node_id)
-        execution.status = NodeStatus.RUNNING
-        execution.started_at = datetime.now()
-        
-        workflow_run.node_executions.append(execution)
+        workflow_run.current_node = node_id
+        log = workflow_run.execution_log
+        log_index = log.append(node_id)
         
         await event_emitter("node_started", {
             "run_id": workflow_run.run_id,
@@ -263,30 +591,37 @@ class WorkflowGraph:
         })
         
         try:
-            # Add a small delay to make streaming visible
-            await asyncio.sleep(0.3)
-            
-            # Prepare parameters
-            params = node.params.copy()
-            
-            # Add state data to params if needed
-            for key, value in params.items():
-                if isinstance(value, str) and value.startswith("$state."):
-                    state_key = value[7:]  # Remove "$state." prefix
-                    params[key] = workflow_run.current_state.get(state_key)
+            # Optional delay to make streaming visible in demos
+            if debug_delay:
+                await asyncio.sleep(debug_delay)
+
+
+            # Prepare parameters: copy the literal params and resolve the
+            # precomputed state references
+            if node.dynamic_params:
+                state_get = workflow_run.current_state.get
+                params = {
+                    **node.static_params,
+                    **{key: state_get(state_key)
+                       for key, state_key in node.dynamic_params}
+                }
+            else:
+                # No state references: pass the prebuilt dict as-is; tools
+                # receive it as **kwargs and cannot mutate the original
+                params = node.static_params
             
             # Execute tool
             result = await self.tool_registry.execute(node.tool_name, **params)
             
-            # Update state with result
-            if isinstance(result, dict):
-                workflow_run.current_state.update(result)
-            else:
-                workflow_run.current_state.set(f"{node_id}_result", result)
+            # Update state with result; concurrent branches write through
+            # the same state, so serialize mutations
+            async with state_lock:
+                if isinstance(result, dict):
+                    workflow_run.current_state.update(result)
+                else:
+                    workflow_run.current_state.set(f"{node_id}_result", result)
             
-            execution.status = NodeStatus.COMPLETED
-            execution.output = {"result": result}
-            execution.completed_at = datetime.now()
+            log.finish(log_index, NodeStatus.COMPLETED, output={"result": result})
             
             await event_emitter("node_completed", {
                 "run_id": workflow_run.run_id,
@@ -297,9 +632,7 @@ class WorkflowGraph:
             logger.info(f"Node {node_id} completed successfully")
             
         except Exception as e:
-            execution.status = NodeStatus.FAILED
-            execution.error = str(e)
-            execution.completed_at = datetime.now()
+            log.finish(log_index, NodeStatus.FAILED, error=str(e))
             
             await event_emitter("node_failed", {
                 "run_id": workflow_run.run_id,
@@ -310,17 +643,28 @@ class WorkflowGraph:
             logger.error(f"Node {node_id} failed: {e}")
             raise
     
-    def _get_next_nodes(self, current_node: str, state: WorkflowState) -> List[str]:
-        """Get next nodes based on edges and conditions"""
+    def _get_next_nodes(
+        self,
+        current_node: str,
+        state: WorkflowState,
+        pending_preds: Dict[str, int]
+    ) -> List[str]:
+        """Get nodes made ready by current_node finishing.
+
+        Satisfied conditional edges fire their target immediately;
+        unconditional edges decrement the target's pending-predecessor
+        count and release it once the count reaches zero.
+        """
         next_nodes = []
-        
-        for edge in self.edges:
-            if edge.from_node == current_node:
-                # Check condition if present
-                if edge.condition:
-                    if edge.condition(state):
-                        next_nodes.append(edge.to_node)
-                else:
+
+        for edge in self.adjacency.get(current_node, ()):
+            if edge.condition:
+                if edge.condition(state):
                     next_nodes.append(edge.to_node)
-        
+            else:
+                remaining = pending_preds.get(edge.to_node, 1) - 1
+                pending_preds[edge.to_node] = remaining
+                if remaining <= 0:
+                    next_nodes.append(edge.to_node)
+
         return next_nodes
\ No newline at end of file
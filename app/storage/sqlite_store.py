@@ -1,29 +1,172 @@
 import sqlite3
-import json
+import orjson
 import asyncio
 import aiosqlite
+from contextlib import asynccontextmanager
 from typing import Dict, List, Optional, Any
 from datetime import datetime
 import logging
+from collections import OrderedDict
 
 from ..core.state import WorkflowRun, WorkflowState, NodeExecution, NodeStatus
+from .storage_worker import StorageWorker
 
 logger = logging.getLogger(__name__)
 
+# Status is stored as a small integer and timestamps as epoch seconds so
+# range filters compare numbers instead of strings and rows stay compact.
+# The API keeps speaking the string enum; mapping happens only at the
+# storage boundary.
+_STATUS_TO_INT = {status: index for index, status in enumerate(NodeStatus)}
+_INT_TO_STATUS = {index: status for index, status in enumerate(NodeStatus)}
+
+
+def _decode_status(value) -> NodeStatus:
+    return _INT_TO_STATUS[value] if isinstance(value, int) else NodeStatus(value)
+
+
+def _decode_timestamp(value) -> Optional[datetime]:
+    if value is None:
+        return None
+    if isinstance(value, (int, float)):
+        return datetime.fromtimestamp(value)
+    return datetime.fromisoformat(value)
+
+
+def _isoformat(value) -> Optional[str]:
+    """Render a stored timestamp as ISO text for API responses"""
+    ts = _decode_timestamp(value)
+    return ts.isoformat() if ts is not None else None
+
+
+def _before_to_epoch(before: str) -> float:
+    """Parse a keyset cursor for the runs table.
+
+    Accepts the ISO text the list endpoints return, or a raw epoch value,
+    and yields the epoch float the created_at column stores.
+    """
+    try:
+        return datetime.fromisoformat(before).timestamp()
+    except ValueError:
+        return float(before)
+
+# Per-connection tuning applied to every SQLite connection. WAL avoids a
+# full-database fsync per commit (the dominant cost on the write-heavy
+# workflow-event path) while keeping readers unblocked by the writer.
+_CONNECTION_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA mmap_size=1073741824",
+    "PRAGMA cache_size=-65536",
+    "PRAGMA busy_timeout=3000",
+    "PRAGMA wal_autocheckpoint=1000",
+)
+
+# Subset safe for the read-only connection (journal/checkpoint settings
+# require write access and belong to the writer thread)
+_READ_PRAGMAS = (
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA mmap_size=1073741824",
+    "PRAGMA cache_size=-65536",
+    "PRAGMA busy_timeout=3000",
+)
+
 
 class SQLiteStorage:
     """SQLite-based storage for workflow graphs and runs"""
-    
+
+    _GRAPH_CACHE_MAX = 128
+
     def __init__(self, db_path: str = "workflow.db"):
         self.db_path = db_path
         self._initialized = False
-    
+        self._worker: Optional[StorageWorker] = None
+        # Long-lived read connection; aiosqlite serializes commands on its
+        # own thread, so sharing one connection across read paths is safe
+        # and avoids a file open plus pragma replay per call
+        self._db: Optional[aiosqlite.Connection] = None
+        # Definitions are immutable between saves, so reads are served
+        # from a small LRU instead of a SQLite query plus JSON parse
+        self._graph_cache: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        # Non-None while inside transaction(); write ops are collected here
+        # and submitted to the writer thread as one commit on exit
+        self._txn_ops: Optional[list] = None
+
+    @asynccontextmanager
+    async def transaction(self):
+        """Group save/delete calls issued inside the block into one commit.
+
+        Writes are collected instead of submitted individually, then handed
+        to the writer thread as a single operation, so the whole group
+        shares one BEGIN IMMEDIATE/COMMIT (and one fsync).
+        """
+        if self._txn_ops is not None:
+            # Already inside a transaction; nest transparently
+            yield self
+            return
+        ops = self._txn_ops = []
+        try:
+            yield self
+        finally:
+            self._txn_ops = None
+        if ops:
+            def _run_all(conn: sqlite3.Connection):
+                for op in ops:
+                    op(conn)
+
+            await self._worker.submit(_run_all)
+
+    async def _submit_write(self, op) -> None:
+        """Send a write to the worker, or defer it to the open transaction"""
+        if self._txn_ops is not None:
+            self._txn_ops.append(op)
+            return
+        await self._worker.submit(op)
+
+    @asynccontextmanager
+    async def _connect(self):
+        """Yield the shared read-only connection, opened lazily.
+
+        All writes go through the writer thread, so the read handle opens
+        with mode=ro; under WAL it never waits on the writer.
+        """
+        if self._db is None:
+            db = aiosqlite.connect(f"file:{self.db_path}?mode=ro", uri=True)
+            # aiosqlite runs each connection on its own thread, non-daemon
+            # by default; daemonize before it starts so a caller that never
+            # reaches close() can still exit the interpreter
+            db.daemon = True
+            db = await db
+            for pragma in _READ_PRAGMAS:
+                await db.execute(pragma)
+            # Rows come back as sqlite3.Row: readable by column name with
+            # no positional tuple packing, still indexable for old callers
+            db.row_factory = aiosqlite.Row
+            self._db = db
+        yield self._db
+
+    async def close(self) -> None:
+        """Close the shared connection and stop the writer thread"""
+        if self._db is not None:
+            await self._db.close()
+            self._db = None
+        if self._worker is not None:
+            self._worker.stop()
+            self._worker = None
+        self._initialized = False
+
     async def initialize(self):
         """Initialize database tables"""
         if self._initialized:
             return
-        
-        async with aiosqlite.connect(self.db_path) as db:
+
+        # One-shot read-write connection for DDL and migration; steady-state
+        # reads use the read-only handle and writes go to the worker thread
+        db = await aiosqlite.connect(self.db_path)
+        try:
+            for pragma in _CONNECTION_PRAGMAS:
+                await db.execute(pragma)
             # Create graphs table
             await db.execute("""
                 CREATE TABLE IF NOT EXISTS graphs (
@@ -38,13 +181,13 @@ class SQLiteStorage:
                 CREATE TABLE IF NOT EXISTS workflow_runs (
                     run_id TEXT PRIMARY KEY,
                     graph_id TEXT NOT NULL,
-                    status TEXT NOT NULL,
+                    status INTEGER NOT NULL,
                     initial_state TEXT NOT NULL,
                     current_state TEXT NOT NULL,
                     current_node TEXT,
                     error TEXT,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    completed_at TIMESTAMP,
+                    created_at REAL,
+                    completed_at REAL,
                     FOREIGN KEY (graph_id) REFERENCES graphs (graph_id)
                 )
             """)
@@ -55,39 +198,114 @@ class SQLiteStorage:
                     execution_id INTEGER PRIMARY KEY AUTOINCREMENT,
                     run_id TEXT NOT NULL,
                     node_id TEXT NOT NULL,
-                    status TEXT NOT NULL,
-                    started_at TIMESTAMP,
-                    completed_at TIMESTAMP,
+                    status INTEGER NOT NULL,
+                    started_at REAL,
+                    completed_at REAL,
                     error TEXT,
                     output TEXT,
                     logs TEXT,
                     FOREIGN KEY (run_id) REFERENCES workflow_runs (run_id)
                 )
             """)
-            
+
+            # Index the FK columns every query filters on; the compound
+            # (run_id, started_at) index also serves get_workflow_run's
+            # ORDER BY without a sort pass
+            await db.execute("""
+                CREATE INDEX IF NOT EXISTS idx_runs_graph
+                ON workflow_runs (graph_id)
+            """)
+            await db.execute("""
+                CREATE INDEX IF NOT EXISTS idx_runs_created
+                ON workflow_runs (created_at DESC)
+            """)
+            await db.execute("""
+                CREATE INDEX IF NOT EXISTS idx_exec_run
+                ON node_executions (run_id, started_at)
+            """)
+
+            await self._migrate_legacy_rows(db)
+
             await db.commit()
-        
+        finally:
+            await db.close()
+
+        # Writes go through a dedicated thread so the event loop never
+        # blocks on an fsync
+        self._worker = StorageWorker(self.db_path, _CONNECTION_PRAGMAS)
+        self._worker.start()
+
         self._initialized = True
         logger.info("Database initialized successfully")
     
+    async def _migrate_legacy_rows(self, db) -> None:
+        """Convert TEXT status / ISO timestamp rows written by old versions.
+
+        Runs once, tracked via PRAGMA user_version. SQLite's type affinity
+        lets the new integer values coexist with legacy columns.
+        """
+        async with db.execute("PRAGMA user_version") as cursor:
+            (schema_version,) = await cursor.fetchone()
+        if schema_version >= 1:
+            return
+
+        status_case = " ".join(
+            f"WHEN '{status.value}' THEN {index}"
+            for status, index in _STATUS_TO_INT.items()
+        )
+        for table in ("workflow_runs", "node_executions"):
+            await db.execute(f"""
+                UPDATE {table}
+                SET status = CASE status {status_case} ELSE status END
+                WHERE typeof(status) = 'text'
+            """)
+        for table, columns in (
+            ("workflow_runs", ("created_at", "completed_at")),
+            ("node_executions", ("started_at", "completed_at")),
+        ):
+            for column in columns:
+                await db.execute(f"""
+                    UPDATE {table}
+                    SET {column} = strftime('%s', {column})
+                    WHERE typeof({column}) = 'text'
+                """)
+        await db.execute("PRAGMA user_version = 1")
+
     async def save_graph(self, graph_id: str, definition: Dict[str, Any]) -> None:
         """Save a workflow graph definition"""
         await self.initialize()
-        
-        async with aiosqlite.connect(self.db_path) as db:
-            await db.execute(
+
+        # orjson writes bytes directly and is several times faster than the
+        # stdlib encoder; default=dict handles read-only MappingProxyType
+        # definitions from the cached workflow builders
+        payload = orjson.dumps(definition, default=dict).decode()
+
+        def _save(conn: sqlite3.Connection):
+            conn.execute(
                 "INSERT OR REPLACE INTO graphs (graph_id, definition) VALUES (?, ?)",
-                (graph_id, json.dumps(definition))
+                (graph_id, payload)
             )
-            await db.commit()
-        
+
+        await self._submit_write(_save)
+        self._cache_graph(graph_id, definition)
         logger.info(f"Saved graph {graph_id}")
+
+    def _cache_graph(self, graph_id: str, definition: Dict[str, Any]) -> None:
+        self._graph_cache[graph_id] = definition
+        self._graph_cache.move_to_end(graph_id)
+        while len(self._graph_cache) > self._GRAPH_CACHE_MAX:
+            self._graph_cache.popitem(last=False)
     
     async def get_graph(self, graph_id: str) -> Optional[Dict[str, Any]]:
         """Get a workflow graph definition"""
         await self.initialize()
-        
-        async with aiosqlite.connect(self.db_path) as db:
+
+        cached = self._graph_cache.get(graph_id)
+        if cached is not None:
+            self._graph_cache.move_to_end(graph_id)
+            return cached
+
+        async with self._connect() as db:
             async with db.execute(
                 "SELECT definition FROM graphs WHERE graph_id = ?", 
                 (graph_id,)
@@ -95,17 +313,31 @@ class SQLiteStorage:
                 row = await cursor.fetchone()
                 
                 if row:
-                    return json.loads(row[0])
+                    definition = orjson.loads(row[0])
+                    self._cache_graph(graph_id, definition)
+                    return definition
                 return None
     
-    async def list_graphs(self) -> List[Dict[str, Any]]:
-        """List all workflow graphs"""
+    async def list_graphs(
+        self, limit: int = 50, before: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """List workflow graphs, newest first.
+
+        Keyset-paginated: pass the last row's created_at as `before` to
+        fetch the next page.
+        """
         await self.initialize()
-        
-        async with aiosqlite.connect(self.db_path) as db:
-            async with db.execute(
-                "SELECT graph_id, created_at FROM graphs ORDER BY created_at DESC"
-            ) as cursor:
+
+        query = "SELECT graph_id, created_at FROM graphs"
+        params: tuple = ()
+        if before:
+            query += " WHERE created_at < ?"
+            params = (before,)
+        query += " ORDER BY created_at DESC LIMIT ?"
+        params += (limit,)
+
+        async with self._connect() as db:
+            async with db.execute(query, params) as cursor:
                 rows = await cursor.fetchall()
                 
                 return [
@@ -116,123 +348,171 @@ class SQLiteStorage:
                     for row in rows
                 ]
     
+    async def iter_graphs(self, limit: int = 50, before: Optional[str] = None):
+        """Iterate graph summaries without materializing the full list"""
+        await self.initialize()
+
+        query = "SELECT graph_id, created_at FROM graphs"
+        params: tuple = ()
+        if before:
+            query += " WHERE created_at < ?"
+            params = (before,)
+        query += " ORDER BY created_at DESC LIMIT ?"
+        params += (limit,)
+
+        async with self._connect() as db:
+            async with db.execute(query, params) as cursor:
+                async for row in cursor:
+                    yield {
+                        "graph_id": row[0],
+                        "created_at": row[1]
+                    }
+
     async def save_workflow_run(self, workflow_run: WorkflowRun) -> None:
         """Save a workflow run"""
         await self.initialize()
-        
-        async with aiosqlite.connect(self.db_path) as db:
+
+        # Serialize on the caller side; the worker thread only runs SQL
+        run_row = (
+            workflow_run.run_id,
+            workflow_run.graph_id,
+            _STATUS_TO_INT[workflow_run.status],
+            workflow_run.initial_state.to_json(),
+            workflow_run.current_state.to_json(),
+            workflow_run.current_node,
+            workflow_run.error,
+            workflow_run.created_at.timestamp(),
+            workflow_run.completed_at.timestamp() if workflow_run.completed_at else None
+        )
+        # Live runs record executions column-wise; zip the columns straight
+        # into rows with no intermediate NodeExecution objects. Reconstructed
+        # runs fall back to the materialized list.
+        log = workflow_run._execution_log
+        if log is not None and len(log):
+            execution_rows = [
+                (
+                    workflow_run.run_id,
+                    node_id,
+                    _STATUS_TO_INT[status],
+                    started.timestamp() if started else None,
+                    completed.timestamp() if completed else None,
+                    error,
+                    orjson.dumps(output).decode() if output else None,
+                    orjson.dumps(logs).decode() if logs else None
+                )
+                for node_id, status, started, completed, error, output, logs in zip(
+                    log.node_ids, log.statuses, log.started_at,
+                    log.completed_at, log.errors, log.outputs, log.logs
+                )
+            ]
+        else:
+            execution_rows = [
+                (
+                    workflow_run.run_id,
+                    execution.node_id,
+                    _STATUS_TO_INT[execution.status],
+                    execution.started_at.timestamp() if execution.started_at else None,
+                    execution.completed_at.timestamp() if execution.completed_at else None,
+                    execution.error,
+                    orjson.dumps(execution.output).decode() if execution.output else None,
+                    orjson.dumps(execution.logs).decode() if execution.logs else None
+                )
+                for execution in workflow_run.node_executions
+            ]
+
+        def _save(conn: sqlite3.Connection):
             # Save main workflow run
-            await db.execute("""
-                INSERT OR REPLACE INTO workflow_runs 
-                (run_id, graph_id, status, initial_state, current_state, 
+            conn.execute("""
+                INSERT OR REPLACE INTO workflow_runs
+                (run_id, graph_id, status, initial_state, current_state,
                  current_node, error, created_at, completed_at)
                 VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                workflow_run.run_id,
-                workflow_run.graph_id,
-                workflow_run.status.value,
-                workflow_run.initial_state.model_dump_json(),
-                workflow_run.current_state.model_dump_json(),
-                workflow_run.current_node,
-                workflow_run.error,
-                workflow_run.created_at.isoformat(),
-                workflow_run.completed_at.isoformat() if workflow_run.completed_at else None
-            ))
-            
-            # Delete existing node executions for this run
-            await db.execute(
+            """, run_row)
+
+            # Replace existing node executions for this run
+            conn.execute(
                 "DELETE FROM node_executions WHERE run_id = ?",
                 (workflow_run.run_id,)
             )
-            
-            # Save node executions
-            for execution in workflow_run.node_executions:
-                await db.execute("""
-                    INSERT INTO node_executions 
+            if execution_rows:
+                conn.executemany("""
+                    INSERT INTO node_executions
                     (run_id, node_id, status, started_at, completed_at, error, output, logs)
                     VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-                """, (
-                    workflow_run.run_id,
-                    execution.node_id,
-                    execution.status.value,
-                    execution.started_at.isoformat() if execution.started_at else None,
-                    execution.completed_at.isoformat() if execution.completed_at else None,
-                    execution.error,
-                    json.dumps(execution.output) if execution.output else None,
-                    json.dumps(execution.logs) if execution.logs else None
-                ))
-            
-            await db.commit()
-        
+                """, execution_rows)
+
+        await self._submit_write(_save)
         logger.info(f"Saved workflow run {workflow_run.run_id}")
     
     async def get_workflow_run(self, run_id: str) -> Optional[WorkflowRun]:
         """Get a workflow run by ID"""
         await self.initialize()
         
-        async with aiosqlite.connect(self.db_path) as db:
-            # Get main workflow run
+        async with self._connect() as db:
+            # One LEFT JOIN fetches the run and its executions together,
+            # avoiding a second statement prepare and run_id B-tree seek;
+            # executions arrive pre-sorted via the (run_id, started_at) index
             async with db.execute("""
-                SELECT graph_id, status, initial_state, current_state, 
-                       current_node, error, created_at, completed_at
-                FROM workflow_runs WHERE run_id = ?
+                SELECT r.graph_id, r.status AS run_status,
+                       r.initial_state, r.current_state,
+                       r.current_node, r.error AS run_error,
+                       r.created_at AS run_created_at,
+                       r.completed_at AS run_completed_at,
+                       e.node_id, e.status AS exec_status,
+                       e.started_at, e.completed_at,
+                       e.error AS exec_error, e.output, e.logs
+                FROM workflow_runs r
+                LEFT JOIN node_executions e ON e.run_id = r.run_id
+                WHERE r.run_id = ?
+                ORDER BY e.started_at
             """, (run_id,)) as cursor:
-                row = await cursor.fetchone()
-                
-                if not row:
-                    return None
-                
-                # Get node executions
-                async with db.execute("""
-                    SELECT node_id, status, started_at, completed_at, error, output, logs
-                    FROM node_executions WHERE run_id = ?
-                    ORDER BY started_at
-                """, (run_id,)) as exec_cursor:
-                    exec_rows = await exec_cursor.fetchall()
-                
-                # Reconstruct workflow run
-                node_executions = []
-                for exec_row in exec_rows:
-                    execution = NodeExecution(
-                        node_id=exec_row[0],
-                        status=NodeStatus(exec_row[1]),
-                        started_at=datetime.fromisoformat(exec_row[2]) if exec_row[2] else None,
-                        completed_at=datetime.fromisoformat(exec_row[3]) if exec_row[3] else None,
-                        error=exec_row[4],
-                        output=json.loads(exec_row[5]) if exec_row[5] else None,
-                        logs=json.loads(exec_row[6]) if exec_row[6] else []
-                    )
-                    node_executions.append(execution)
-                
-                workflow_run = WorkflowRun(
-                    run_id=run_id,
-                    graph_id=row[0],
-                    status=NodeStatus(row[1]),
-                    initial_state=WorkflowState.model_validate_json(row[2]),
-                    current_state=WorkflowState.model_validate_json(row[3]),
-                    current_node=row[4],
-                    error=row[5],
-                    created_at=datetime.fromisoformat(row[6]),
-                    completed_at=datetime.fromisoformat(row[7]) if row[7] else None,
-                    node_executions=node_executions
-                )
-                
+                workflow_run = None
+                node_executions: List[NodeExecution] = []
+
+                async for row in cursor:
+                    if workflow_run is None:
+                        workflow_run = WorkflowRun(
+                            run_id=run_id,
+                            graph_id=row["graph_id"],
+                            status=_decode_status(row["run_status"]),
+                            initial_state=WorkflowState.model_validate_json(row["initial_state"]),
+                            current_state=WorkflowState.model_validate_json(row["current_state"]),
+                            current_node=row["current_node"],
+                            error=row["run_error"],
+                            created_at=_decode_timestamp(row["run_created_at"]),
+                            completed_at=_decode_timestamp(row["run_completed_at"]),
+                            node_executions=node_executions
+                        )
+                    if row["node_id"] is None:
+                        continue  # Run with no executions (LEFT JOIN padding)
+                    node_executions.append(NodeExecution(
+                        node_id=row["node_id"],
+                        status=_decode_status(row["exec_status"]),
+                        started_at=_decode_timestamp(row["started_at"]),
+                        completed_at=_decode_timestamp(row["completed_at"]),
+                        error=row["exec_error"],
+                        output=orjson.loads(row["output"]) if row["output"] else None,
+                        logs=orjson.loads(row["logs"]) if row["logs"] else []
+                    ))
+
                 return workflow_run
     
-    async def list_workflow_runs(self, graph_id: Optional[str] = None) -> List[Dict[str, Any]]:
-        """List workflow runs, optionally filtered by graph_id"""
+    async def list_workflow_runs(
+        self,
+        graph_id: Optional[str] = None,
+        limit: int = 50,
+        before: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """List workflow runs, newest first, optionally filtered by graph_id.
+
+        Keyset-paginated: pass the last row's created_at as `before` to
+        fetch the next page.
+        """
         await self.initialize()
+
+        query, params = self._runs_query(graph_id, limit, before)
         
-        query = "SELECT run_id, graph_id, status, created_at, completed_at FROM workflow_runs"
-        params = ()
-        
-        if graph_id:
-            query += " WHERE graph_id = ?"
-            params = (graph_id,)
-        
-        query += " ORDER BY created_at DESC"
-        
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self._connect() as db:
             async with db.execute(query, params) as cursor:
                 rows = await cursor.fetchall()
                 
@@ -240,65 +520,97 @@ class SQLiteStorage:
                     {
                         "run_id": row[0],
                         "graph_id": row[1],
-                        "status": row[2],
-                        "created_at": row[3],
-                        "completed_at": row[4]
+                        "status": _decode_status(row[2]).value,
+                        "created_at": _isoformat(row[3]),
+                        "completed_at": _isoformat(row[4])
                     }
                     for row in rows
                 ]
     
+    @staticmethod
+    def _runs_query(
+        graph_id: Optional[str], limit: int, before: Optional[str]
+    ) -> tuple:
+        query = "SELECT run_id, graph_id, status, created_at, completed_at FROM workflow_runs"
+        params: tuple = ()
+        where = []
+        if graph_id:
+            where.append("graph_id = ?")
+            params += (graph_id,)
+        if before:
+            where.append("created_at < ?")
+            params += (_before_to_epoch(before),)
+        if where:
+            query += " WHERE " + " AND ".join(where)
+        query += " ORDER BY created_at DESC LIMIT ?"
+        return query, params + (limit,)
+
+    async def iter_workflow_runs(
+        self,
+        graph_id: Optional[str] = None,
+        limit: int = 50,
+        before: Optional[str] = None
+    ):
+        """Iterate run summaries without materializing the full list"""
+        await self.initialize()
+
+        query, params = self._runs_query(graph_id, limit, before)
+
+        async with self._connect() as db:
+            async with db.execute(query, params) as cursor:
+                async for row in cursor:
+                    yield {
+                        "run_id": row[0],
+                        "graph_id": row[1],
+                        "status": _decode_status(row[2]).value,
+                        "created_at": _isoformat(row[3]),
+                        "completed_at": _isoformat(row[4])
+                    }
+
     async def delete_graph(self, graph_id: str) -> bool:
         """Delete a workflow graph and all associated runs"""
         await self.initialize()
-        
-        async with aiosqlite.connect(self.db_path) as db:
-            # First, get all runs for this graph
-            async with db.execute(
-                "SELECT run_id FROM workflow_runs WHERE graph_id = ?",
-                (graph_id,)
-            ) as cursor:
-                run_ids = [row[0] for row in await cursor.fetchall()]
-            
-            # Delete node executions for these runs
-            for run_id in run_ids:
-                await db.execute(
-                    "DELETE FROM node_executions WHERE run_id = ?",
-                    (run_id,)
+        self._graph_cache.pop(graph_id, None)
+
+        # Writes must go through the worker thread: the shared handle is
+        # read-only. Submitted directly (not via _submit_write) because the
+        # caller needs the rowcount back.
+        def _delete(conn: sqlite3.Connection) -> bool:
+            # Delete node executions for this graph's runs in one
+            # set-based statement instead of a round-trip per run
+            conn.execute(
+                """
+                DELETE FROM node_executions WHERE run_id IN (
+                    SELECT run_id FROM workflow_runs WHERE graph_id = ?
                 )
-            
-            # Delete workflow runs
-            await db.execute(
+                """,
+                (graph_id,)
+            )
+            conn.execute(
                 "DELETE FROM workflow_runs WHERE graph_id = ?",
                 (graph_id,)
             )
-            
-            # Delete the graph
-            result = await db.execute(
+            result = conn.execute(
                 "DELETE FROM graphs WHERE graph_id = ?",
                 (graph_id,)
             )
-            
-            await db.commit()
-            
             return result.rowcount > 0
-    
+
+        return await self._worker.submit(_delete)
+
     async def delete_workflow_run(self, run_id: str) -> bool:
         """Delete a specific workflow run"""
         await self.initialize()
-        
-        async with aiosqlite.connect(self.db_path) as db:
-            # Delete node executions
-            await db.execute(
+
+        def _delete(conn: sqlite3.Connection) -> bool:
+            conn.execute(
                 "DELETE FROM node_executions WHERE run_id = ?",
                 (run_id,)
             )
-            
-            # Delete workflow run
-            result = await db.execute(
+            result = conn.execute(
                 "DELETE FROM workflow_runs WHERE run_id = ?",
                 (run_id,)
             )
-            
-            await db.commit()
-            
-            return result.rowcount > 0
\ No newline at end of file
+            return result.rowcount > 0
+
+        return await self._worker.submit(_delete)
\ No newline at end of file
@@ -0,0 +1,128 @@
+import asyncio
+import logging
+import queue
+import sqlite3
+import threading
+import time
+from typing import Any, Callable, Iterable, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class StorageWorker(threading.Thread):
+    """Dedicated writer thread owning a single SQLite connection.
+
+    SQLite has no real async I/O, so write paths that run on the event loop
+    end up blocking it on fsyncs. This worker keeps one thread-confined
+    `sqlite3.Connection`; async callers submit operations via `submit()`,
+    which only enqueues (microseconds) and returns an awaitable future. The
+    worker drains the queue, accumulating up to `batch_size` operations or a
+    `batch_window` of time, and executes them inside a single transaction so
+    concurrent writers share one commit/fsync.
+    """
+
+    _STOP = object()
+
+    def __init__(
+        self,
+        db_path: str,
+        pragmas: Iterable[str] = (),
+        batch_size: int = 32,
+        batch_window: float = 0.02,
+    ):
+        super().__init__(name="sqlite-storage-worker", daemon=True)
+        self.db_path = db_path
+        self.pragmas = tuple(pragmas)
+        self.batch_size = batch_size
+        self.batch_window = batch_window
+        self._queue: queue.SimpleQueue = queue.SimpleQueue()
+
+    def submit(self, op: Callable[[sqlite3.Connection], Any]) -> asyncio.Future:
+        """Enqueue an operation; returns a future resolved with its result.
+
+        Must be called from a running event loop.
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._queue.put((op, future, loop))
+        return future
+
+    def stop(self) -> None:
+        """Stop the worker after draining pending operations"""
+        self._queue.put(self._STOP)
+        self.join()
+
+    def run(self) -> None:
+        # autocommit off; transactions are managed explicitly per batch
+        conn = sqlite3.connect(self.db_path, isolation_level=None)
+        try:
+            for pragma in self.pragmas:
+                conn.execute(pragma)
+
+            stopping = False
+            while not stopping:
+                item = self._queue.get()
+                if item is self._STOP:
+                    break
+
+                # Accumulate a batch within the debounce window
+                batch = [item]
+                deadline = time.monotonic() + self.batch_window
+                while len(batch) < self.batch_size:
+                    timeout = deadline - time.monotonic()
+                    if timeout <= 0:
+                        break
+                    try:
+                        nxt = self._queue.get(timeout=timeout)
+                    except queue.Empty:
+                        break
+                    if nxt is self._STOP:
+                        stopping = True
+                        break
+                    batch.append(nxt)
+
+                self._execute_batch(conn, batch)
+        finally:
+            try:
+                # Refresh planner statistics for the next open; cheap no-op
+                # unless enough has changed to warrant analysis
+                conn.execute("PRAGMA optimize")
+            except sqlite3.Error as e:
+                logger.debug(f"PRAGMA optimize on close failed: {e}")
+            conn.close()
+
+    def _execute_batch(self, conn: sqlite3.Connection, batch) -> None:
+        """Execute a batch of operations inside one transaction"""
+        results = []
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            for op, future, loop in batch:
+                try:
+                    results.append((future, loop, op(conn), None))
+                except Exception as e:
+                    logger.error(f"Storage operation failed: {e}")
+                    results.append((future, loop, None, e))
+            conn.commit()
+        except sqlite3.Error as e:
+            # BEGIN or COMMIT failed (disk full, lock past busy_timeout):
+            # the whole batch rolled back. Fail every future with the error
+            # instead of letting the exception kill the worker thread and
+            # strand all pending submits on unresolved futures.
+            logger.error(f"Storage batch failed: {e}")
+            try:
+                conn.rollback()
+            except sqlite3.Error:
+                pass
+            results = [(future, loop, None, e) for op, future, loop in batch]
+
+        for future, loop, result, error in results:
+            loop.call_soon_threadsafe(self._resolve, future, result, error)
+
+    @staticmethod
+    def _resolve(future: asyncio.Future, result: Any, error: Optional[Exception]) -> None:
+        if future.cancelled():
+            return
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(result)
@@ -1,11 +1,24 @@
-from typing import Dict, List, Any
+import asyncio
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Dict, List, Any, Mapping
 from ..core.workflow_engine import WorkflowEngine
 from ..core.tools import tool_registry
 
+# Bound once at import; avoids a registry dict lookup per call
+_calc_score = tool_registry.get("calculate_summary_score")
 
-def create_summarization_workflow() -> Dict[str, Any]:
+# Cap on concurrent per-chunk summary calls
+_CHUNK_CONCURRENCY = 8
+
+
+@lru_cache(maxsize=1)
+def create_summarization_workflow() -> Mapping[str, Any]:
     """
     Create the summarization + refinement workflow definition.
+
+    The definition is static, so it is built once and returned as a
+    read-only mapping; callers must copy before mutating.
     
     Workflow steps:
     1. Split text into chunks
@@ -94,8 +107,8 @@ def create_summarization_workflow() -> Dict[str, Any]:
             }
         ]
     }
-    
-    return workflow_definition
+
+    return MappingProxyType(workflow_definition)
 
 
 # Register additional tools for the summarization workflow
@@ -104,17 +117,20 @@ async def process_chunks(chunks: List[str], max_length: int = 200) -> Dict[str,
     """Process multiple chunks and generate summaries"""
     if not chunks:
         return {"chunk_summaries": []}
-    
-    chunk_summaries = []
-    
-    for i, chunk in enumerate(chunks):
-        if not chunk.strip():
-            continue
-            
-        # Use the existing generate_summary tool
-        summary = await tool_registry.execute("generate_summary", text=chunk, max_length=max_length)
-        chunk_summaries.append(summary)
-    
+
+    # Summarize all chunks concurrently; gather preserves chunk order
+    sem = asyncio.Semaphore(_CHUNK_CONCURRENCY)
+
+    async def _summarize(chunk: str) -> str:
+        async with sem:
+            return await tool_registry.execute(
+                "generate_summary", text=chunk, max_length=max_length
+            )
+
+    chunk_summaries = list(await asyncio.gather(
+        *(_summarize(chunk) for chunk in chunks if chunk.strip())
+    ))
+
     return {"chunk_summaries": chunk_summaries}
 
 
@@ -131,7 +147,7 @@ def quality_assessment(original_text: str, summary: str, target_length: int) ->
         }
     
     summary_length = len(summary)
-    quality_score = tool_registry._tools["calculate_summary_score"](original_text, summary)
+    quality_score = _calc_score(original_text, summary)
     
     # Determine if refinement is needed
     needs_refinement = summary_length > target_length and quality_score < 0.8
@@ -152,35 +168,36 @@ def quality_assessment(original_text: str, summary: str, target_length: int) ->
     return assessment
 
 
-# Create sample workflow function for easy testing
-def create_sample_summarization_run() -> Dict[str, Any]:
-    """Create a sample summarization workflow run with test data"""
-    
-    sample_text = """
-    Artificial Intelligence (AI) refers to the simulation of human intelligence in machines 
-    that are programmed to think and learn like humans. The term may also be applied to any 
-    machine that exhibits traits associated with a human mind such as learning and 
-    problem-solving. The ideal characteristic of artificial intelligence is its ability to 
+# Sample input for easy testing; stripped once at import instead of per call
+_SAMPLE_TEXT = """
+    Artificial Intelligence (AI) refers to the simulation of human intelligence in machines
+    that are programmed to think and learn like humans. The term may also be applied to any
+    machine that exhibits traits associated with a human mind such as learning and
+    problem-solving. The ideal characteristic of artificial intelligence is its ability to
     rationalize and take actions that have the best chance of achieving a specific goal.
-    
-    Machine Learning is a subset of AI that provides systems the ability to automatically 
-    learn and improve from experience without being explicitly programmed. Machine learning 
-    focuses on the development of computer programs that can access data and use it to learn 
-    for themselves. The process of learning begins with observations or data, such as examples, 
-    direct experience, or instruction, in order to look for patterns in data and make better 
+
+    Machine Learning is a subset of AI that provides systems the ability to automatically
+    learn and improve from experience without being explicitly programmed. Machine learning
+    focuses on the development of computer programs that can access data and use it to learn
+    for themselves. The process of learning begins with observations or data, such as examples,
+    direct experience, or instruction, in order to look for patterns in data and make better
     decisions in the future based on the examples that we provide.
-    
-    Deep Learning is a subset of machine learning in artificial intelligence that has networks 
-    capable of learning unsupervised from data that is unstructured or unlabeled. Also known 
-    as deep neural learning or deep neural network, it is inspired by the structure and 
-    function of the brain, specifically the neural network. Deep learning algorithms attempt 
-    to draw similar conclusions as humans would by continually analyzing data with a logical 
-    structure. To achieve this, deep learning applications use a layered structure of 
+
+    Deep Learning is a subset of machine learning in artificial intelligence that has networks
+    capable of learning unsupervised from data that is unstructured or unlabeled. Also known
+    as deep neural learning or deep neural network, it is inspired by the structure and
+    function of the brain, specifically the neural network. Deep learning algorithms attempt
+    to draw similar conclusions as humans would by continually analyzing data with a logical
+    structure. To achieve this, deep learning applications use a layered structure of
     algorithms called an artificial neural network.
-    """
-    
+    """.strip()
+
+
+# Create sample workflow function for easy testing
+def create_sample_summarization_run() -> Dict[str, Any]:
+    """Create a sample summarization workflow run with test data"""
     return {
-        "input_text": sample_text.strip(),
+        "input_text": _SAMPLE_TEXT,
         "target_length": 300,
         "chunk_size": 500,
         "overlap": 50
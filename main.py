@@ -1,10 +1,9 @@
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 import logging
-import asyncio
 from contextlib import asynccontextmanager
 
-from app.api.endpoints import router, storage
+from app.api.endpoints import router, storage, startup_event, shutdown_event, spawn_run
 from app.workflows.summarization import create_summarization_workflow, create_sample_summarization_run
 from app.workflows.llm_summarization import create_llm_summarization_workflow, create_sample_llm_summarization_run
 from app.api.endpoints import workflow_engine
@@ -24,9 +23,10 @@ async def lifespan(app: FastAPI):
     # Startup
     logger.info("Starting workflow engine application...")
     
-    # Initialize storage
-    await storage.initialize()
-    
+    # Initialize storage and start the API's background workers; router
+    # on_event hooks don't fire under a custom lifespan
+    await startup_event()
+
     # Register both workflows
     try:
         # Original rule-based workflow
@@ -51,8 +51,9 @@ async def lifespan(app: FastAPI):
     
     yield
     
-    # Shutdown
+    # Shutdown: drain in-flight runs, flush pending writes, close storage
     logger.info("Shutting down application...")
+    await shutdown_event()
 
 
 # Create FastAPI application
@@ -117,16 +118,16 @@ async def demo_summarization():
         
         # Get sample data
         sample_data = create_sample_summarization_run()
-        
-        # Start workflow execution
-        task = asyncio.create_task(
-            workflow_engine.run_workflow(graph_id, sample_data)
-        )
-        
+
+        # Start workflow execution under the shared concurrency cap; the
+        # task reference is held until the run finishes
+        run_id = spawn_run(graph_id, sample_data)
+
         # Return run information
         return {
             "message": "Demo summarization workflow started",
             "graph_id": graph_id,
+            "run_id": run_id,
             "sample_data": sample_data,
             "note": "Use GET /api/v1/runs to see execution results"
         }
@@ -152,19 +153,19 @@ async def demo_llm_summarization():
         
         # Get sample data
         sample_data = create_sample_llm_summarization_run()
-        
-        # Start workflow execution
-        task = asyncio.create_task(
-            workflow_engine.run_workflow(graph_id, sample_data)
-        )
-        
+
+        # Start workflow execution under the shared concurrency cap; the
+        # task reference is held until the run finishes
+        run_id = spawn_run(graph_id, sample_data)
+
         # Return run information
         return {
             "message": "Demo LLM summarization workflow started",
             "graph_id": graph_id,
+            "run_id": run_id,
             "sample_data": sample_data,
             "note": "This uses Groq LLM for high-quality summaries. Use WebSocket to see real-time progress!",
-            "websocket_tip": f"Connect to ws://localhost:8000/api/v1/ws/{{run_id}} for streaming"
+            "websocket_tip": f"Connect to ws://localhost:8000/api/v1/ws/{run_id} for streaming"
         }
         
     except Exception as e:
@@ -3,17 +3,49 @@
 Interactive LLM Workflow Test - Choose between rule-based and LLM-powered workflows
 """
 import asyncio
+import logging
 import sys
 import os
-from datetime import datetime
+import time
+from pathlib import Path
 
-# Add project root to path
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# Add project root to path; resolved once at import
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from runner import RunSpec, init_components, run
 
-from app.core.workflow_engine import WorkflowEngine
-from app.core.tools import tool_registry
 from app.workflows.llm_summarization import create_llm_summarization_workflow
-from app.storage.sqlite_store import SQLiteStorage
+from app.workflows.summarization import create_summarization_workflow
+
+logger = logging.getLogger(__name__)
+
+# Workflow shapes are fixed; evaluate the factories once at import time
+LLM_WORKFLOW_DEF = create_llm_summarization_workflow()
+RULE_WORKFLOW_DEF = create_summarization_workflow()
+
+# Pre-stripped at import time so the while-loop below doesn't re-allocate
+# and re-strip the sample on every iteration
+SAMPLE_CLIMATE_TEXT = """
+Climate change represents one of the most pressing challenges of our time. Rising global temperatures are causing widespread environmental changes including melting ice caps, rising sea levels, and extreme weather patterns. The primary cause is increased greenhouse gas emissions from human activities such as burning fossil fuels, deforestation, and industrial processes. Carbon dioxide levels have reached unprecedented heights, leading to ocean acidification and ecosystem disruption. Scientists warn that without immediate action to reduce emissions and transition to renewable energy sources, the consequences could be catastrophic for future generations. International cooperation through agreements like the Paris Climate Accord aims to limit global warming to 1.5 degrees Celsius above pre-industrial levels.
+""".strip()
+
+
+async def _ainput(prompt):
+    """Read a line of input without blocking the event loop"""
+    return await asyncio.get_running_loop().run_in_executor(None, input, prompt)
+
+
+async def _prewarm_llm(engine, graph_id):
+    """Run one tiny workflow in the background while the user types, so the
+    first real submission doesn't pay connection/model cold-start cost"""
+    try:
+        await engine.run_workflow(graph_id, {
+            "input_text": "Warm-up text for the summarization pipeline.",
+            "target_length": 50,
+            "quality_threshold": 0.0,
+        })
+    except Exception:
+        logger.debug("LLM prewarm failed", exc_info=True)
 
 
 async def interactive_test():
@@ -23,46 +55,53 @@ async def interactive_test():
     print("LLM-powered intelligent summarization with Groq\n")
     
     # Initialize components
-    project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-    db_path = os.path.join(project_root, "db", "test_interactive.db")
-    engine = WorkflowEngine(tool_registry)
-    storage = SQLiteStorage(db_path)
-    await storage.initialize()
+    engine, storage = await init_components("test_interactive.db")
     
+    # Workflow graphs are invariant across iterations — build each once up
+    # front instead of re-validating and re-registering per loop pass
+    graph_ids = {
+        "rule": engine.create_graph(RULE_WORKFLOW_DEF),
+        "llm": engine.create_graph(LLM_WORKFLOW_DEF),
+    }
+
+    # Warm the LLM path while the user reads the menu; input() now runs in
+    # the executor, so this task makes progress during typing
+    prewarm = asyncio.create_task(_prewarm_llm(engine, graph_ids["llm"]))
+
     while True:
         print("\n" + "="*50)
-        print("🤖 LLM WORKFLOW OPTIONS:")
-        print("1. Run LLM-Powered Summarization (intelligent, context-aware)")
-        print("2. Exit")
-        
+        print("🤖 WORKFLOW OPTIONS:")
+        print("1. Run Rule-Based Summarization (fast, deterministic)")
+        print("2. Run LLM-Powered Summarization (intelligent, context-aware)")
+        print("3. Exit")
+
         # Choose workflow
-        workflow_choice = input("\nChoose option (1/2): ").strip()
-        
-        if workflow_choice == "2":
+        workflow_choice = (await _ainput("\nChoose option (1/2/3): ")).strip()
+
+        if workflow_choice == "3":
             print("👋 Goodbye!")
             break
         elif workflow_choice == "1":
-            workflow = create_llm_summarization_workflow()
+            graph_id = graph_ids["rule"]
+            workflow_name = "Rule-Based Summarization ⚡"
+        elif workflow_choice == "2":
+            graph_id = graph_ids["llm"]
             workflow_name = "LLM-Powered Summarization 🤖"
         else:
             print("❌ Invalid choice. Using LLM workflow.")
-            workflow = create_llm_summarization_workflow()
+            graph_id = graph_ids["llm"]
             workflow_name = "LLM-Powered Summarization 🤖"
-        
-        # Create workflow graph
-        graph_id = engine.create_graph(workflow)
-        print(f"✅ Created workflow: {workflow_name}")
+
+        print(f"✅ Selected workflow: {workflow_name}")
         print(f"🆔 Graph ID: {graph_id}")
         
         # Get user input
         print(f"\n📝 INPUT:")
         print("Enter text to summarize (or 'sample' for sample text):")
-        user_input = input("> ").strip()
+        user_input = (await _ainput("> ")).strip()
         
         if user_input.lower() == 'sample':
-            input_text = """
-            Climate change represents one of the most pressing challenges of our time. Rising global temperatures are causing widespread environmental changes including melting ice caps, rising sea levels, and extreme weather patterns. The primary cause is increased greenhouse gas emissions from human activities such as burning fossil fuels, deforestation, and industrial processes. Carbon dioxide levels have reached unprecedented heights, leading to ocean acidification and ecosystem disruption. Scientists warn that without immediate action to reduce emissions and transition to renewable energy sources, the consequences could be catastrophic for future generations. International cooperation through agreements like the Paris Climate Accord aims to limit global warming to 1.5 degrees Celsius above pre-industrial levels.
-            """
+            input_text = SAMPLE_CLIMATE_TEXT
         elif not user_input:
             print("❌ No input provided. Skipping...")
             continue
@@ -70,19 +109,17 @@ async def interactive_test():
             input_text = user_input
         
         # Get target length
-        target_input = input(f"Target summary length (default: 200): ").strip()
+        target_input = (await _ainput(f"Target summary length (default: 200): ")).strip()
         target_length = int(target_input) if target_input.isdigit() else 200
         
         # Prepare execution data
-        execution_data = {
-            "input_text": input_text.strip(),
-            "target_length": target_length,
-            "quality_threshold": 0.7
-        }
+        execution_data = RunSpec(
+            input_text=input_text, target_length=target_length
+        ).as_dict()
         
         print(f"\n⚡ PROCESSING with {workflow_name}...")
         print(f"📊 Input: {len(input_text)} chars → Target: {target_length} chars")
-        print(f"⏱️  Started at: {datetime.now().strftime('%H:%M:%S')}")
+        print(f"⏱️  Started at: {time.strftime('%H:%M:%S')}")
         
         # Execute workflow
         try:
@@ -98,22 +135,28 @@ async def interactive_test():
                 
         except Exception as e:
             print(f"❌ Error during execution: {e}")
-            import traceback
-            traceback.print_exc()
+            # Formats the traceback only if an ERROR handler is attached
+            logger.exception("Workflow execution failed")
         
         # Ask if user wants to continue
-        continue_choice = input(f"\n🔄 Test another workflow? (y/n): ").strip().lower()
+        continue_choice = (await _ainput(f"\n🔄 Test another workflow? (y/n): ")).strip().lower()
         if continue_choice != 'y':
             break
-    
+
+    if not prewarm.done():
+        prewarm.cancel()
+    await asyncio.gather(prewarm, return_exceptions=True)
+
+    await storage.close()
+
     print("\n🎉 Interactive test session completed!")
 
 if __name__ == "__main__":
+    logging.basicConfig(level=os.environ.get("LOGLEVEL", "INFO"))
     try:
-        asyncio.run(interactive_test())
+        run(interactive_test())
     except KeyboardInterrupt:
         print("\n\n👋 Interrupted by user. Goodbye!")
     except Exception as e:
         print(f"\n❌ Unexpected error: {e}")
-        import traceback
-        traceback.print_exc()
\ No newline at end of file
+        logger.exception("Interactive test crashed")
\ No newline at end of file
@@ -4,15 +4,40 @@ Quick LLM Workflow Test - Default test using LLM-powered summarization
 """
 import asyncio
 import sys
-import os
+from pathlib import Path
 
-# Add project root to path
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# Add project root to path; resolved once at import
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from dataclasses import replace
+
+from runner import RunSpec, init_components, run
 
-from app.core.workflow_engine import WorkflowEngine
 from app.core.tools import tool_registry
-from app.workflows.llm_summarization import create_llm_summarization_workflow
-from app.storage.sqlite_store import SQLiteStorage
+from app.workflows.llm_summarization import (
+    create_llm_summarization_workflow,
+    merge_streamed_summaries,
+    stream_chunks_llm,
+)
+
+# Workflow shape is fixed; evaluate the factory once at import time
+LLM_WORKFLOW_DEF = create_llm_summarization_workflow()
+
+# Pre-stripped at import time; referenced directly below
+SAMPLE_AI_TEXT = """
+Artificial Intelligence (AI) has revolutionized numerous industries in recent years. Machine learning algorithms enable computers to learn from data without explicit programming. Deep learning, a subset of machine learning, uses neural networks with multiple layers to process complex patterns. Natural language processing allows machines to understand and generate human language. Computer vision enables machines to interpret visual information. These technologies have applications in healthcare, finance, transportation, and entertainment. AI systems can now diagnose diseases, detect fraud, power autonomous vehicles, and create realistic content. However, ethical considerations around AI bias, privacy, and job displacement remain important challenges to address.
+""".strip()
+
+async def stream_run(engine, graph_id, execution_data):
+    """Consume one run's event stream; returns (event count, final run)"""
+    event_count = 0
+    final_run = None
+    async for event in engine.stream_workflow(graph_id, execution_data):
+        event_count += 1
+        if event["event_type"] in ("workflow_completed", "workflow_failed"):
+            final_run = engine.get_run(event["data"]["run_id"])
+    return event_count, final_run
+
 
 async def main():
     """Quick test of the LLM-powered workflow system"""
@@ -20,47 +45,53 @@ async def main():
     print("=" * 50)
     
     # Initialize components
-    project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-    db_path = os.path.join(project_root, "db", "test_llm_quick.db")
-    engine = WorkflowEngine(tool_registry)
-    storage = SQLiteStorage(db_path)
-    await storage.initialize()
+    engine, storage = await init_components("test_llm_quick.db")
     
     # Create LLM-powered workflow
     print("\n📋 Creating LLM-powered summarization workflow...")
-    workflow_def = create_llm_summarization_workflow()
-    graph_id = engine.create_graph(workflow_def)
+    graph_id = engine.create_graph(LLM_WORKFLOW_DEF)
     print(f"✅ Created LLM workflow with ID: {graph_id}")
     
-    # Test data
-    test_text = """
-    Artificial Intelligence (AI) has revolutionized numerous industries in recent years. Machine learning algorithms enable computers to learn from data without explicit programming. Deep learning, a subset of machine learning, uses neural networks with multiple layers to process complex patterns. Natural language processing allows machines to understand and generate human language. Computer vision enables machines to interpret visual information. These technologies have applications in healthcare, finance, transportation, and entertainment. AI systems can now diagnose diseases, detect fraud, power autonomous vehicles, and create realistic content. However, ethical considerations around AI bias, privacy, and job displacement remain important challenges to address.
-    """
-    
     # Run workflow with LLM
     print("\n⚡ Running LLM-powered summarization...")
-    print(f"📝 Input text length: {len(test_text)} characters")
-    
-    execution_data = {
-        "input_text": test_text.strip(),
-        "target_length": 200,
-        "quality_threshold": 0.7
-    }
-    
-    # Execute workflow
+    print(f"📝 Input text length: {len(SAMPLE_AI_TEXT)} characters")
+
+    spec = RunSpec(input_text=SAMPLE_AI_TEXT)
+
+    # Dispatch several target lengths concurrently — in-flight requests let
+    # the LLM backend batch them instead of serving one generation at a time
+    target_lengths = (100, 150, 200, 250)
     try:
-        result = await engine.run_workflow(graph_id, execution_data)
-        
-        print(f"\n🎯 Execution Result:")
-        print(f"✅ Status: {result.status}")
-        print(f"📊 Final summary: {result.current_state.get('final_summary', 'No summary generated')}")
-        print(f"📏 Summary length: {len(result.current_state.get('final_summary', ''))}")
-        print(f"🔍 Quality score: {result.current_state.get('quality_score', 'N/A')}")
-        
+        # Each run is consumed incrementally via the engine's event stream
+        # instead of blocking on the final state
+        results = await asyncio.gather(*[
+            stream_run(engine, graph_id, replace(spec, target_length=t).as_dict())
+            for t in target_lengths
+        ])
+
+        for target_length, (event_count, result) in zip(target_lengths, results):
+            print(f"\n🎯 Execution Result (target {target_length}):")
+            print(f"📨 Events observed: {event_count}")
+            print(f"✅ Status: {result.status}")
+            print(f"📊 Final summary: {result.current_state.get('final_summary', 'No summary generated')}")
+            print(f"📏 Summary length: {len(result.current_state.get('final_summary', ''))}")
+            print(f"🔍 Quality score: {result.current_state.get('quality_score', 'N/A')}")
+
     except Exception as e:
         print(f"❌ Error during execution: {e}")
-    
+
+    # Exercise the streaming chunk API: summaries arrive in finish order
+    # and the merge consumes them without waiting for the full list
+    print("\n🌊 Streaming chunk summaries...")
+    chunks = await tool_registry.execute(
+        "split_text", text=SAMPLE_AI_TEXT, chunk_size=400, overlap=50
+    )
+    merged = await merge_streamed_summaries(stream_chunks_llm(chunks, max_length=120))
+    print(f"🧵 Merged {len(chunks)} streamed chunks into {len(merged)} chars")
+
+    await storage.close()
+
     print("\n🎉 LLM Quick test completed!")
 
 if __name__ == "__main__":
-    asyncio.run(main())
\ No newline at end of file
+    run(main())
\ No newline at end of file
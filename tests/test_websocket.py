@@ -3,138 +3,191 @@
 Quick WebSocket Test
 """
 import asyncio
-import json
-import requests
+import httpx
+import orjson
 import websockets
 
-async def test_websocket_streaming():
-    base_url = "http://localhost:8000"
-    api_base = f"{base_url}/api/v1"
-    
-    print("🧪 Testing WebSocket Streaming Fix")
-    print("=" * 40)
-    
-    # Check server
-    try:
-        response = requests.get(f"{base_url}/health")
-        print(f"✅ Server health: {response.status_code}")
-    except:
-        print("❌ Server not running. Start with: python main.py")
-        return
-    
-    # Get graph ID
-    response = requests.get(f"{api_base}/graphs")
-    graphs = response.json()['graphs']
-    if not graphs:
-        print("❌ No graphs available")
-        return
-    
-    graph_id = graphs[0]['graph_id']
-    print(f"📋 Using graph: {graph_id}")
-    
-    # Prepare test data
-    test_text = """
-    This is a test document for WebSocket streaming. We want to see the workflow 
-    execute step by step with proper event streaming. The text should be long enough 
-    to trigger multiple processing steps and demonstrate the asynchronous execution 
-    capabilities of our workflow engine.
-    """
-    
-    run_request = {
-        "graph_id": graph_id,
-        "initial_state": {
-            "input_text": test_text.strip(),
-            "target_length": 100
-        }
-    }
-    
-    # Start workflow
-    print(f"\n🚀 Starting workflow...")
-    response = requests.post(f"{api_base}/graph/run", json=run_request)
-    
-    if response.status_code != 200:
-        print(f"❌ Failed: {response.status_code} - {response.text}")
-        return
-    
-    run_data = response.json()
-    run_id = run_data['run_id']
-    print(f"✅ Started run: {run_id}")
-    print(f"   Status: {run_data['status']}")
-    
-    # Connect to WebSocket
-    websocket_url = f"ws://localhost:8000/api/v1/ws/{run_id}"
-    print(f"\n🌐 Connecting to: {websocket_url}")
-    
+from runner import run
+
+# Pre-stripped at import time; referenced directly below
+SAMPLE_STREAMING_TEXT = """
+This is a test document for WebSocket streaming. We want to see the workflow
+execute step by step with proper event streaming. The text should be long enough
+to trigger multiple processing steps and demonstrate the asynchronous execution
+capabilities of our workflow engine.
+""".strip()
+
+async def stream_events(websocket_url):
+    """Consume workflow events over the WebSocket until a terminal event"""
     try:
         async with websockets.connect(websocket_url) as ws:
             print("✅ WebSocket connected! Waiting for events...\n")
-            
+
             events_count = 0
-            timeout_count = 0
             max_timeout = 30  # 30 seconds max wait
-            
-            while timeout_count < max_timeout:
+
+            # One rolling deadline instead of waking every second: a single
+            # wait_for covers the full remaining window and resets on activity
+            loop = asyncio.get_running_loop()
+            deadline = loop.time() + max_timeout
+            timed_out = False
+
+            while True:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    timed_out = True
+                    break
                 try:
-                    # Wait for message with 1 second timeout
-                    message = await asyncio.wait_for(ws.recv(), timeout=1.0)
-                    event = json.loads(message)
-                    
-                    events_count += 1
-                    event_type = event.get('event_type', 'unknown')
-                    data = event.get('data', {})
-                    
-                    print(f"📨 [{events_count}] {event_type}")
-                    
-                    # Show relevant data based on event type
-                    if event_type == "node_started":
-                        print(f"   Node: {data.get('node_id')} ({data.get('tool')})")
-                    elif event_type == "node_completed":
-                        print(f"   Node: {data.get('node_id')} - Success")
-                        result = data.get('result')
-                        if isinstance(result, list):
-                            print(f"   Result: {len(result)} items")
-                        elif isinstance(result, str):
-                            print(f"   Result: {len(result)} chars")
-                    elif event_type == "workflow_completed":
-                        print("🎉 Workflow completed!")
-                        break
-                    elif event_type == "workflow_failed":
-                        print(f"💥 Workflow failed: {data.get('error')}")
+                    message = await asyncio.wait_for(ws.recv(), timeout=remaining)
+                    parsed = orjson.loads(message)
+
+                    # Server may coalesce several events into one array frame
+                    events = parsed if isinstance(parsed, list) else [parsed]
+                    done = False
+                    for event in events:
+                        events_count += 1
+                        event_type = event.get('event_type', 'unknown')
+                        data = event.get('data', {})
+
+                        print(f"📨 [{events_count}] {event_type}")
+
+                        # Show relevant data based on event type
+                        if event_type == "node_started":
+                            print(f"   Node: {data.get('node_id')} ({data.get('tool')})")
+                        elif event_type == "node_completed":
+                            print(f"   Node: {data.get('node_id')} - Success")
+                            result = data.get('result')
+                            if isinstance(result, list):
+                                print(f"   Result: {len(result)} items")
+                            elif isinstance(result, str):
+                                print(f"   Result: {len(result)} chars")
+                        elif event_type == "workflow_completed":
+                            print("🎉 Workflow completed!")
+                            done = True
+                        elif event_type == "workflow_failed":
+                            print(f"💥 Workflow failed: {data.get('error')}")
+                            done = True
+
+                    if done:
                         break
-                    
-                    timeout_count = 0  # Reset timeout counter on successful event
-                    
+
+                    deadline = loop.time() + max_timeout  # reset on activity
+
                 except asyncio.TimeoutError:
-                    timeout_count += 1
-                    if timeout_count % 5 == 0:  # Print every 5 seconds
-                        print(f"⏳ Waiting for events... ({timeout_count}s)")
-                
+                    timed_out = True
+                    break
+
                 except websockets.exceptions.ConnectionClosed:
                     print("🔌 WebSocket connection closed")
                     break
-            
-            if timeout_count >= max_timeout:
+
+            if timed_out:
                 print("⚠️ Timeout reached, checking final status...")
-            
+
             print(f"\n📊 Total events received: {events_count}")
-    
+
     except Exception as e:
         print(f"❌ WebSocket error: {e}")
-    
-    # Check final status
-    print(f"\n🔍 Checking final status...")
-    response = requests.get(f"{api_base}/graph/state/{run_id}")
-    
-    if response.status_code == 200:
+
+
+async def poll_final_status(http, run_id, timeout=30):
+    """Poll the run state until a terminal status or the deadline passes"""
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout  # matches the event stream's window
+    while True:
+        response = await http.get(f"/api/v1/graph/state/{run_id}")
+
+        if response.status_code == 404:
+            # /graph/run returns before the run is registered, so the
+            # first polls can 404; keep retrying until the deadline
+            if loop.time() >= deadline:
+                print(f"\n⚠️ Run never appeared within {timeout}s, giving up")
+                return
+            await asyncio.sleep(1.0)
+            continue
+
+        if response.status_code != 200:
+            print(f"\n❌ Could not get final status: {response.status_code}")
+            return
+
         status_data = response.json()
-        print(f"✅ Final status: {status_data['status']}")
-        print(f"   Nodes executed: {len(status_data['node_executions'])}")
-        
-        if 'final_summary' in status_data['current_state']:
-            summary = status_data['current_state']['final_summary']
-            print(f"📜 Summary: {summary[:100]}...")
-    else:
-        print(f"❌ Could not get final status: {response.status_code}")
+        if status_data['status'] in ("completed", "failed"):
+            break
+        if loop.time() >= deadline:
+            print(f"\n⚠️ Run still {status_data['status']} after {timeout}s, giving up")
+            return
+        await asyncio.sleep(1.0)
+
+    print(f"\n🔍 Final status check...")
+    print(f"✅ Final status: {status_data['status']}")
+    print(f"   Nodes executed: {len(status_data['node_executions'])}")
+
+    if 'final_summary' in status_data['current_state']:
+        summary = status_data['current_state']['final_summary']
+        print(f"📜 Summary: {summary[:100]}...")
+
+
+async def test_websocket_streaming():
+    base_url = "http://localhost:8000"
+
+    print("🧪 Testing WebSocket Streaming Fix")
+    print("=" * 40)
+
+    async with httpx.AsyncClient(base_url=base_url, timeout=10) as http:
+        # Check server
+        try:
+            response = await http.get("/health")
+            print(f"✅ Server health: {response.status_code}")
+        except Exception:
+            print("❌ Server not running. Start with: python main.py")
+            return
+
+        # Get graph ID
+        response = await http.get("/api/v1/graphs")
+        graphs = response.json()['graphs']
+        if not graphs:
+            print("❌ No graphs available")
+            return
+
+        graph_id = graphs[0]['graph_id']
+        print(f"📋 Using graph: {graph_id}")
+
+        # Prepare test data
+        run_request = {
+            "graph_id": graph_id,
+            "initial_state": {
+                "input_text": SAMPLE_STREAMING_TEXT,
+                "target_length": 100
+            }
+        }
+
+        # Start workflow
+        print(f"\n🚀 Starting workflow...")
+        response = await http.post(
+            "/api/v1/graph/run",
+            content=orjson.dumps(run_request),
+            headers={"content-type": "application/json"},
+        )
+
+        if response.status_code != 200:
+            print(f"❌ Failed: {response.status_code} - {response.text}")
+            return
+
+        run_data = response.json()
+        run_id = run_data['run_id']
+        print(f"✅ Started run: {run_id}")
+        print(f"   Status: {run_data['status']}")
+
+        # Connect to WebSocket
+        websocket_url = f"ws://localhost:8000/api/v1/ws/{run_id}"
+        print(f"\n🌐 Connecting to: {websocket_url}")
+
+        # Stream events and poll for the terminal status concurrently so the
+        # final state is already in hand when the event stream finishes
+        await asyncio.gather(
+            stream_events(websocket_url),
+            poll_final_status(http, run_id),
+        )
 
 if __name__ == "__main__":
-    asyncio.run(test_websocket_streaming())
\ No newline at end of file
+    run(test_websocket_streaming())
@@ -5,16 +5,22 @@ Simple test script to verify the workflow engine functionality
 
 import asyncio
 import json
+import logging
 import sys
 import os
+from pathlib import Path
 
-# Add project root to path
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# Add project root to path; resolved once at import
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
 
-from app.core.workflow_engine import WorkflowEngine
+from runner import init_components, run
 from app.core.tools import tool_registry
 from app.workflows.llm_summarization import create_llm_summarization_workflow, create_sample_llm_summarization_run
-from app.storage.sqlite_store import SQLiteStorage
+
+logger = logging.getLogger(__name__)
+
+# Workflow shape is fixed; evaluate the factory once at import time
+LLM_WORKFLOW_DEF = create_llm_summarization_workflow()
 
 
 async def test_workflow_engine():
@@ -22,17 +28,11 @@ async def test_workflow_engine():
     print("🚀 Testing Workflow Engine...")
     
     # Initialize components
-    project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-    db_path = os.path.join(project_root, "db", "test_workflow.db")
-    engine = WorkflowEngine(tool_registry)
-    storage = SQLiteStorage(db_path)
-    await storage.initialize()
+    engine, storage = await init_components("test_workflow.db")
     
     # Test 1: Create workflow graph
     print("\n📋 Test 1: Creating LLM-powered summarization workflow...")
-    workflow_def = create_llm_summarization_workflow()
-    graph_id = engine.create_graph(workflow_def)
-    await storage.save_graph(graph_id, workflow_def)
+    graph_id = engine.create_graph(LLM_WORKFLOW_DEF)
     print(f"✅ Created graph with ID: {graph_id}")
     
     # Test 2: Run workflow
@@ -43,10 +43,15 @@ async def test_workflow_engine():
     
     try:
         workflow_run = await engine.run_workflow(graph_id, sample_data)
-        await storage.save_workflow_run(workflow_run)
-        
+
+        # Persist graph and run in one transaction so both writes share a
+        # single commit/fsync
+        async with storage.transaction():
+            await storage.save_graph(graph_id, LLM_WORKFLOW_DEF)
+            await storage.save_workflow_run(workflow_run)
+
         print(f"✅ Workflow completed with status: {workflow_run.status}")
-        print(f"📊 Executed {len(workflow_run.node_executions)} nodes")
+        print(f"📊 Executed {len(workflow_run.executions())} nodes")
         
         # Show results
         final_state = workflow_run.current_state.data
@@ -60,6 +65,9 @@ async def test_workflow_engine():
             
     except Exception as e:
         print(f"❌ Workflow failed: {e}")
+        # Formats the traceback only if an ERROR handler is attached
+        logger.exception("Workflow run failed")
+        await storage.close()
         return False
     
     # Test 3: Tool registry
@@ -88,6 +96,10 @@ async def test_workflow_engine():
     else:
         print("❌ Failed to retrieve run from storage")
     
+    # Close the read connection and stop the writer thread so the script
+    # exits promptly
+    await storage.close()
+
     print("\n🎉 All tests completed successfully!")
     return True
 
@@ -98,14 +110,15 @@ async def test_individual_tools():
     
     sample_text = "This is a test text for tool validation. It should be processed correctly by our tools."
     
-    # Test text splitting
-    chunks = await tool_registry.execute("split_text", text=sample_text, chunk_size=50, overlap=10)
+    # Splitting and summary generation are independent — overlap them; only
+    # the score depends on the summary
+    chunks, summary = await asyncio.gather(
+        tool_registry.execute("split_text", text=sample_text, chunk_size=50, overlap=10),
+        tool_registry.execute("generate_summary", text=sample_text, max_length=100),
+    )
     print(f"✅ split_text: Generated {len(chunks)} chunks")
-    
-    # Test summary generation
-    summary = await tool_registry.execute("generate_summary", text=sample_text, max_length=100)
     print(f"✅ generate_summary: Generated {len(summary)} char summary")
-    
+
     # Test quality scoring
     score = await tool_registry.execute("calculate_summary_score", original_text=sample_text, summary=summary)
     print(f"✅ calculate_summary_score: Score = {score}")
@@ -114,15 +127,18 @@ async def test_individual_tools():
 
 
 if __name__ == "__main__":
+    logging.basicConfig(level=os.environ.get("LOGLEVEL", "INFO"))
+
     async def main():
         print("🧪 Workflow Engine Test Suite")
         print("=" * 50)
         
-        # Test individual tools first
-        await test_individual_tools()
-        
-        # Test full workflow
-        success = await test_workflow_engine()
+        # The tool checks and the full workflow are independent — run them
+        # concurrently so the tool suite overlaps the workflow's I/O waits
+        _, success = await asyncio.gather(
+            test_individual_tools(),
+            test_workflow_engine(),
+        )
         
         if success:
             print("\n🎊 All tests passed! The workflow engine is ready to use.")
@@ -134,4 +150,4 @@ if __name__ == "__main__":
             sys.exit(1)
     
     # Run the test suite
-    asyncio.run(main())
\ No newline at end of file
+    run(main())
\ No newline at end of file